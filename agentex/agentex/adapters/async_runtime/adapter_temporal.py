@@ -3,14 +3,15 @@ from enum import Enum
 from typing import Annotated, Callable, Union
 
 from fastapi import Depends
-from temporalio.client import WorkflowExecutionStatus
+from temporalio.client import WorkflowExecutionStatus, WorkflowFailureError
 from temporalio.common import WorkflowIDReusePolicy, RetryPolicy as TemporalRetryPolicy
 from temporalio.service import RPCError, RPCStatusCode
 
 from agentex.adapters.async_runtime.port import AsyncRuntime, DuplicateWorkflowPolicy
-from agentex.config.dependencies import DTemporalClient
+from agentex.config.dependencies import DTemporalClient, singleton
 from agentex.domain.entities.workflows import WorkflowState, RetryPolicy
 from agentex.utils.logging import make_logger
+from agentex.utils.metrics import instrument
 from agentex.utils.model_utils import BaseModel
 
 logger = make_logger(__name__)
@@ -73,6 +74,7 @@ DUPLICATE_POLICY_TO_ID_REUSE_POLICY = {
 }
 
 
+@instrument("temporal")
 class TemporalGateway(AsyncRuntime):
 
     def __init__(self, temporal_client: DTemporalClient):
@@ -123,6 +125,24 @@ class TemporalGateway(AsyncRuntime):
                 )
             raise
 
+    async def wait_for_workflow(self, workflow_id: str) -> WorkflowState:
+        try:
+            handle = self.client.get_workflow_handle(workflow_id=workflow_id)
+            # Long-polls the workflow history on the server until the workflow closes, following continue-as-new
+            await handle.result()
+        except WorkflowFailureError:
+            # Failed, canceled, terminated and timed out workflows all raise; their final status tells them apart
+            pass
+        except RPCError as e:
+            if e.status == RPCStatusCode.NOT_FOUND:
+                return WorkflowState(
+                    status="NOT_FOUND",
+                    reason="Workflow not found",
+                    is_terminal=True,
+                )
+            raise
+        return await self.get_workflow_status(workflow_id=workflow_id)
+
     async def terminate_workflow(self, workflow_id: str) -> None:
         return await self.client.get_workflow_handle(workflow_id).terminate()
 
@@ -130,4 +150,4 @@ class TemporalGateway(AsyncRuntime):
         return await self.client.get_workflow_handle(workflow_id).cancel()
 
 
-DTemporalGateway = Annotated[TemporalGateway, Depends(TemporalGateway)]
+DTemporalGateway = Annotated[TemporalGateway, Depends(singleton(TemporalGateway))]
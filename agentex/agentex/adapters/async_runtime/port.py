@@ -44,6 +44,10 @@ class AsyncRuntime(ABC):
     async def get_workflow_status(self, workflow_id: str) -> WorkflowState:
         pass
 
+    @abstractmethod
+    async def wait_for_workflow(self, workflow_id: str) -> WorkflowState:
+        pass
+
     @abstractmethod
     async def terminate_workflow(self, workflow_id: str) -> None:
         pass
@@ -1,17 +1,33 @@
-from contextlib import asynccontextmanager
-from typing import Annotated, AsyncGenerator, List, TypeVar, Optional, Generic, Type
-
+import base64
+import json
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import (
+    Annotated, Any, AsyncGenerator, AsyncIterator, Dict, Iterator, List, Tuple, TypeVar, Optional, Generic, Type,
+)
+
+import asyncpg
 from fastapi import Depends
-from sqlalchemy import exc, select, update, delete
+from sqlalchemy import Enum, Select, bindparam, exc, func, or_, select, update, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from agentex.adapters.crud_store.exceptions import DuplicateItemError, ItemDoesNotExist
+from agentex.adapters.crud_store.exceptions import DuplicateItemError, ItemDoesNotExist, InvalidCursorError
 from agentex.adapters.crud_store.port import CRUDRepository
 from agentex.adapters.orm import BaseORM
-from agentex.config.dependencies import DDatabaseAsyncReadWriteSessionMaker
+from agentex.config.dependencies import (
+    DDatabaseAsyncReadOnlySessionMaker,
+    DDatabaseAsyncReadWriteSessionMaker,
+    DEnvironmentVariables,
+)
+from agentex.domain.entities.pagination import Page
 from agentex.domain.exceptions import ServiceError, ClientError
 from agentex.utils.logging import make_logger
+from agentex.utils.metrics import DB_POOL_CHECKOUT_DURATION, instrument
 from agentex.utils.model_utils import BaseModel
+from agentex.utils.saturation import saturation_monitor
 
 logger = make_logger(__name__)
 
@@ -45,30 +61,111 @@ async def async_sql_exception_handler():
         raise e
 
 
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """Encode the keyset position of the last item on a page into an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by `encode_cursor` back into its (created_at, id) keyset position."""
+    try:
+        created_at, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(message="Invalid pagination cursor.", detail=str(e))
+
+
+class _WriteTracker:
+    def __init__(self):
+        self.last_write_at: Optional[float] = None
+
+
+# When the current request, or task outside of one, last wrote to the primary
+_write_tracker: ContextVar[Optional[_WriteTracker]] = ContextVar("write_tracker", default=None)
+
+
+@contextmanager
+def read_your_writes() -> Iterator[None]:
+    """
+    Scope, such as a request, in which reads go to the primary for READ_YOUR_WRITES_SECONDS after a write, including
+    writes made by tasks it spawns. Outside of a scope, only writes made earlier in the same task are seen.
+    """
+    token = _write_tracker.set(_WriteTracker())
+    try:
+        yield
+    finally:
+        _write_tracker.reset(token)
+
+
 T = TypeVar("T", bound=BaseModel)
 M = TypeVar("M", bound=BaseORM)
 
+STREAM_BATCH_SIZE = 1000
+# The most bind parameters Postgres accepts in one statement
+MAX_BIND_PARAMETERS = 32767
+
 
+@instrument("postgres", scope_attribute="table_name")
 class PostgresCRUDRepository(CRUDRepository[T], Generic[M, T]):
     def __init__(
         self,
         async_read_write_session_maker: DDatabaseAsyncReadWriteSessionMaker,
+        async_read_only_session_maker: DDatabaseAsyncReadOnlySessionMaker,
         orm: Type[M],
         entity: Type[T],
+        environment_variables: DEnvironmentVariables,
     ):
         self.async_rw_session_maker = async_read_write_session_maker
+        self.async_ro_session_maker = async_read_only_session_maker
         self.orm = orm
         self.entity = entity
+        self.table_name = orm.__tablename__
+        self.read_your_writes_seconds = environment_variables.READ_YOUR_WRITES_SECONDS
+        self.bulk_create_min_items = environment_variables.BULK_CREATE_MIN_ITEMS
 
     @asynccontextmanager
     async def start_async_db_session(self, allow_writes: Optional[bool] = True) -> AsyncGenerator[AsyncSession, None]:
-        if allow_writes:
-            session_maker = self.async_rw_session_maker
+        """
+        Start a session on the primary if `allow_writes` is set, otherwise on the read replica, unless reads are
+        pinned to the primary to read this request's writes.
+        """
+        if allow_writes or self._reads_pinned_to_primary():
+            session_maker, pool = self.async_rw_session_maker, "read_write"
         else:
-            raise NotImplementedError("Read-only sessions are not yet supported.")
-        async with session_maker() as session:
-            async with session.begin():
-                yield session
+            session_maker, pool = self.async_ro_session_maker, "read_only"
+        try:
+            async with session_maker() as session:
+                async with session.begin():
+                    # Check out the connection up front to measure how long the pool makes sessions wait
+                    start = time.perf_counter()
+                    await session.connection()
+                    checkout_wait = time.perf_counter() - start
+                    DB_POOL_CHECKOUT_DURATION.labels(pool=pool).observe(checkout_wait)
+                    saturation_monitor.record_db_checkout_wait(checkout_wait)
+                    yield session
+        finally:
+            if allow_writes:
+                self._record_write()
+
+    def _record_write(self) -> None:
+        if self.read_your_writes_seconds is None:
+            return
+        tracker = _write_tracker.get()
+        if tracker is None:
+            tracker = _WriteTracker()
+            _write_tracker.set(tracker)
+        tracker.last_write_at = time.monotonic()
+
+    def _reads_pinned_to_primary(self) -> bool:
+        if self.read_your_writes_seconds is None:
+            return False
+        tracker = _write_tracker.get()
+        return (
+            tracker is not None
+            and tracker.last_write_at is not None
+            and time.monotonic() - tracker.last_write_at < self.read_your_writes_seconds
+        )
 
     async def create(self, item: T) -> T:
         async with self.start_async_db_session(True) as session, async_sql_exception_handler():
@@ -79,6 +176,8 @@ class PostgresCRUDRepository(CRUDRepository[T], Generic[M, T]):
             return self.entity.from_orm(orm)
 
     async def batch_create(self, items: List[T]) -> List[T]:
+        if items and len(items) >= self.bulk_create_min_items:
+            return await self._copy_create(items)
         async with self.start_async_db_session(True) as session, async_sql_exception_handler():
             # Prepare a list of ORM instances from items
             orm_instances = [self.orm(**item.to_dict()) for item in items]
@@ -92,12 +191,12 @@ class PostgresCRUDRepository(CRUDRepository[T], Generic[M, T]):
             return [self.entity.from_orm(orm_instance) for orm_instance in orm_instances]
 
     async def get(self, id: Optional[str] = None, name: Optional[str] = None) -> T:
-        async with self.start_async_db_session(True) as session, async_sql_exception_handler():
+        async with self.start_async_db_session(False) as session, async_sql_exception_handler():
             result = await self._get(session, id, name)
             return self.entity.from_orm(result)
 
     async def batch_get(self, ids: Optional[List[str]] = None, names: Optional[List[str]] = None) -> List[T]:
-        async with self.start_async_db_session(True) as session, async_sql_exception_handler():
+        async with self.start_async_db_session(False) as session, async_sql_exception_handler():
             results = await self._batch_get(session, ids, names)
             return [self.entity.from_orm(result) for result in results]
 
@@ -124,6 +223,54 @@ class PostgresCRUDRepository(CRUDRepository[T], Generic[M, T]):
             # Return the updated items as ORM objects
             return [self.entity.from_orm(item) for item in items]
 
+    async def upsert(
+        self,
+        item: T,
+        conflict_columns: Optional[List[str]] = None,
+        update_columns: Optional[List[str]] = None,
+    ) -> T:
+        async with self.start_async_db_session(True) as session, async_sql_exception_handler():
+            results = await self._upsert(session, [item.to_dict()], conflict_columns, update_columns)
+            await session.commit()
+            return self.entity.from_orm(results[0])
+
+    async def batch_upsert(
+        self,
+        items: List[T],
+        conflict_columns: Optional[List[str]] = None,
+        update_columns: Optional[List[str]] = None,
+    ) -> List[T]:
+        if not items:
+            return []
+        async with self.start_async_db_session(True) as session, async_sql_exception_handler():
+            rows = [item.to_dict() for item in items]
+            # Stay under the bind parameter limit, since each row takes one per column
+            batch_size = max(1, MAX_BIND_PARAMETERS // len(rows[0]))
+            results = []
+            for start in range(0, len(rows), batch_size):
+                results.extend(
+                    await self._upsert(session, rows[start:start + batch_size], conflict_columns, update_columns)
+                )
+            await session.commit()
+            return [self.entity.from_orm(result) for result in results]
+
+    async def patch(self, id: str, **fields: Any) -> T:
+        async with self.start_async_db_session(True) as session, async_sql_exception_handler():
+            for column_name in fields:
+                self._column(column_name)
+            # RETURNING gives back the updated row, so there is no need to read it before or after
+            result = await session.scalar(
+                update(self.orm)
+                .where(self.orm.id == id)
+                .values(**fields)
+                .returning(self.orm)
+                .execution_options(synchronize_session=False)
+            )
+            if result is None:
+                raise ItemDoesNotExist(f"Item with id '{id}' does not exist.")
+            await session.commit()
+            return self.entity.from_orm(result)
+
     async def delete(self, id: Optional[str] = None, name: Optional[str] = None) -> None:
         async with self.start_async_db_session(True) as session, async_sql_exception_handler():
             # Ensure at least one of id or name is provided
@@ -156,11 +303,187 @@ class PostgresCRUDRepository(CRUDRepository[T], Generic[M, T]):
             await session.execute(stmt)
             await session.commit()
 
-    async def list(self) -> List[T]:
+    async def list(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[T]:
+        async with self.start_async_db_session(False) as session, async_sql_exception_handler():
+            query = self._page_query(filters, created_after, created_before, limit, cursor)
+            results = (await session.scalars(query)).all()
+
+            next_cursor = None
+            if limit is not None and len(results) > limit:
+                results = results[:limit]
+                next_cursor = encode_cursor(results[-1].created_at, results[-1].id)
+
+            return Page(
+                items=[self.entity.from_orm(result) for result in results],
+                next_cursor=next_cursor,
+            )
+
+    async def stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        entity: Optional[Type[T]] = None,
+    ) -> AsyncIterator[T]:
+        entity = entity or self.entity
+        async with self.start_async_db_session(False) as session, async_sql_exception_handler():
+            query = (
+                self._filtered_query(filters, created_after, created_before)
+                .order_by(self.orm.created_at.asc(), self.orm.id.asc())
+                .execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            # Rows are fetched from a server-side cursor in batches, so memory stays flat regardless of table size
+            results = await session.stream_scalars(query)
+            async for result in results:
+                yield entity.from_orm(result)
+
+    async def _copy_create(self, items: List[T]) -> List[T]:
+        """
+        Create the items with COPY, which Postgres ingests far faster than the INSERTs the unit of work issues,
+        at the cost of skipping the ORM. Python column defaults are applied here instead, and columns the items do
+        not set are left out of the COPY, so that their server defaults apply.
+        """
+        rows = [item.to_dict() for item in items]
+        columns = [
+            column for column in self.orm.__table__.columns
+            if column.name in rows[0] or column.default is not None
+        ]
         async with self.start_async_db_session(True) as session, async_sql_exception_handler():
-            result = await session.execute(select(self.orm).order_by(self.orm.created_at.asc()))
-            results = result.scalars()
-            return [self.entity.from_orm(result) for result in results]
+            connection = await session.connection()
+            dialect = connection.dialect
+            # Convert values the way their column types would for an INSERT, e.g. enums to their names
+            processors = [column.type.bind_processor(dialect) for column in columns]
+            for row in rows:
+                for column in columns:
+                    if column.name not in row and column.default is not None:
+                        row[column.name] = (
+                            column.default.arg(None) if column.default.is_callable else column.default.arg
+                        )
+            records = [
+                tuple(
+                    processor(row.get(column.name)) if processor else row.get(column.name)
+                    for column, processor in zip(columns, processors)
+                )
+                for row in rows
+            ]
+
+            raw_connection = await connection.get_raw_connection()
+            try:
+                await raw_connection.driver_connection.copy_records_to_table(
+                    self.table_name,
+                    records=records,
+                    columns=[column.name for column in columns],
+                )
+            # Errors come straight from asyncpg rather than through SQLAlchemy, so translate them here
+            except asyncpg.UniqueViolationError as e:
+                raise DuplicateItemError(
+                    message="Item already exists. Please check all unique constraints and try again.",
+                    detail=str(e)
+                )
+            except asyncpg.IntegrityConstraintViolationError as e:
+                raise ServiceError(
+                    message=f"Invalid input resulted in constraint violation: {e}", detail=str(e)
+                )
+            await session.commit()
+        # Column defaults only fill in columns the entities do not have, so the items are already as stored
+        return list(items)
+
+    async def _upsert(
+        self,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]],
+        conflict_columns: Optional[List[str]],
+        update_columns: Optional[List[str]],
+    ) -> List[M]:
+        """Upsert the rows in one INSERT ... ON CONFLICT DO UPDATE statement, returning them in the order given."""
+        if conflict_columns is None:
+            conflict_columns = [column.name for column in self.orm.__table__.primary_key.columns]
+        if update_columns is None:
+            update_columns = [
+                name for name in rows[0]
+                if name not in conflict_columns and name not in ("id", "created_at")
+            ]
+        statement = insert(self.orm).values(rows)
+        updates = {name: statement.excluded[self._column(name).name] for name in update_columns}
+        # Column onupdate defaults are not applied to the DO UPDATE clause
+        if "updated_at" in self.orm.__table__.columns and "updated_at" not in updates:
+            updates["updated_at"] = func.now()
+        statement = statement.on_conflict_do_update(index_elements=conflict_columns, set_=updates)
+        results = (await session.scalars(statement.returning(self.orm))).all()
+
+        # Postgres does not guarantee that RETURNING follows the order of the VALUES
+        results_by_key = {tuple(getattr(result, name) for name in conflict_columns): result for result in results}
+        return [results_by_key[tuple(row[name] for name in conflict_columns)] for row in rows]
+
+    def _column(self, column_name: str):
+        column = self.orm.__table__.columns.get(column_name)
+        if column is None:
+            raise ClientError(f"{self.orm.__tablename__} has no field '{column_name}'.")
+        return column
+
+    def _page_query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Select:
+        """
+        The query for one page of `list`. It seeks past the cursor and orders by (created_at, id), so that an index
+        ending in those columns serves both the seek and the order without a sort.
+        """
+        query = self._filtered_query(filters, created_after, created_before)
+        if cursor is not None:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(self.orm.created_at, self.orm.id) > tuple_(cursor_created_at, cursor_id)
+            )
+        query = query.order_by(self.orm.created_at.asc(), self.orm.id.asc())
+        if limit is not None:
+            # Fetch one extra row so we know whether there is a next page without a COUNT query
+            query = query.limit(limit + 1)
+        return query
+
+    def _filtered_query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> Select:
+        """
+        Filter by columns, where a list matches any of its values. None matches null, including within a list.
+        """
+        query = select(self.orm)
+        for column_name, value in (filters or {}).items():
+            column = self.orm.__table__.columns.get(column_name)
+            if column is None:
+                raise ClientError(f"Cannot filter {self.orm.__tablename__} by unknown field '{column_name}'.")
+            if isinstance(value, (list, tuple, set)):
+                values = [item for item in value if item is not None]
+                if isinstance(column.type, Enum):
+                    # Enums have few values, so they are inlined rather than bound. That lets the planner prove
+                    # that the query matches partial indexes on them even when it reuses a generic plan.
+                    condition = column.in_(bindparam(column_name, values, expanding=True, literal_execute=True))
+                else:
+                    condition = column.in_(values)
+                if len(values) < len(value):
+                    condition = or_(condition, column.is_(None))
+                query = query.where(condition)
+            else:
+                query = query.where(column == value)
+        if created_after is not None:
+            query = query.where(self.orm.created_at >= created_after)
+        if created_before is not None:
+            query = query.where(self.orm.created_at < created_before)
+        return query
 
     async def _get(self, session: AsyncSession, id: Optional[str] = None, name: Optional[str] = None) -> M:
         if id is not None:
@@ -179,11 +502,11 @@ class PostgresCRUDRepository(CRUDRepository[T], Generic[M, T]):
 
     async def _batch_get(
         self, session: AsyncSession, ids: Optional[List[str]] = None, names: Optional[List[str]] = None
-    ) -> M:
+    ) -> List[M]:
         if ids is not None:
-            results = await session.execute(select(self.orm).filter(self.orm.id.in_(ids)))
+            results = (await session.scalars(select(self.orm).filter(self.orm.id.in_(ids)))).all()
         elif names is not None:
-            results = await session.execute(select(self.orm).filter(self.orm.name.in_(names)))
+            results = (await session.scalars(select(self.orm).filter(self.orm.name.in_(names)))).all()
         else:
             raise ClientError("Either ids or names must be provided.")
         if results is None:
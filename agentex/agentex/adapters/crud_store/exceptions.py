@@ -15,3 +15,11 @@ class ItemDoesNotExist(ClientError):
     """
 
     code = 400
+
+
+class InvalidCursorError(ClientError):
+    """
+    Exception raised when a pagination cursor cannot be decoded.
+    """
+
+    code = 400
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Annotated, List, TypeVar, Generic, Optional
+from datetime import datetime
+from typing import Annotated, Any, AsyncIterator, Dict, List, TypeVar, Generic, Optional, Type
 
 from fastapi import Depends
 
+from agentex.domain.entities.pagination import Page
+
 T = TypeVar("T")
 
 
@@ -32,6 +35,34 @@ class CRUDRepository(ABC, Generic[T]):
     async def batch_update(self, items: List[T]) -> List[T]:
         pass
 
+    @abstractmethod
+    async def upsert(
+        self,
+        item: T,
+        conflict_columns: Optional[List[str]] = None,
+        update_columns: Optional[List[str]] = None,
+    ) -> T:
+        """
+        Insert the item, or if one already exists with the same `conflict_columns` (the primary key by default),
+        update its `update_columns` (all others by default) instead. Returns the item as stored.
+        """
+        pass
+
+    @abstractmethod
+    async def batch_upsert(
+        self,
+        items: List[T],
+        conflict_columns: Optional[List[str]] = None,
+        update_columns: Optional[List[str]] = None,
+    ) -> List[T]:
+        """Upsert each item as in `upsert`. Returns the items as stored, in the order given."""
+        pass
+
+    @abstractmethod
+    async def patch(self, id: str, **fields: Any) -> T:
+        """Update only the given fields of the item with the id. Returns the updated item."""
+        pass
+
     @abstractmethod
     async def delete(self, id: Optional[str] = None, name: Optional[str] = None) -> None:
         pass
@@ -41,7 +72,34 @@ class CRUDRepository(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    async def list(self) -> List[T]:
+    async def list(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[T]:
+        """
+        List items ordered by creation time.
+
+        `filters` maps column names to a value (or a list of values) to match. If `limit` is set, at most
+        `limit` items are returned along with a cursor that can be passed back to fetch the next page.
+        """
+        pass
+
+    @abstractmethod
+    def stream(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        entity: Optional[Type[T]] = None,
+    ) -> AsyncIterator[T]:
+        """
+        Iterate over all matching items ordered by creation time without loading them all into memory at once.
+        Items are built as `entity` if given, so that callers can read columns the repository's entity leaves out.
+        """
         pass
 
 
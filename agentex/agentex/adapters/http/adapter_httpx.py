@@ -4,23 +4,28 @@ import httpx
 from fastapi import Depends
 
 from agentex.adapters.http.port import HttpPort
+from agentex.config.dependencies import DHttpClient, singleton
 from agentex.utils.logging import make_logger
+from agentex.utils.metrics import instrument
 
 logger = make_logger(__name__)
 
 
+@instrument("http")
 class HttpxGateway(HttpPort):
 
+    def __init__(self, http_client: DHttpClient):
+        self.http_client = http_client
+
     async def async_call(
         self,
         method: Literal["GET", "POST", "PUT", "DELETE"],
         url: str,
         payload: Optional[Dict] = None
     ) -> Dict:
-        async with httpx.AsyncClient() as client:
-            response = await client.request(method, url, json=payload)
-            response.raise_for_status()
-            return response.json()
+        response = await self.http_client.request(method, url, json=payload)
+        response.raise_for_status()
+        return response.json()
 
     async def call(
         self,
@@ -33,4 +38,4 @@ class HttpxGateway(HttpPort):
         return response.json()
 
 
-DHttpxGateway = Annotated[HttpxGateway, Depends(HttpxGateway)]
+DHttpxGateway = Annotated[HttpxGateway, Depends(singleton(HttpxGateway))]
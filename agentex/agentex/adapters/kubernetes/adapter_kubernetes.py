@@ -2,16 +2,17 @@ from typing import Annotated, Optional, Dict
 
 from fastapi import Depends
 from kubernetes_asyncio import client
-from kubernetes_asyncio.client import V1Job, ApiClient, ApiException, V1Deployment, V1Service, V1PodDisruptionBudget
+from kubernetes_asyncio.client import V1Job, ApiException, V1Deployment, V1Service, V1PodDisruptionBudget
 
 from agentex.adapters.http.adapter_httpx import DHttpxGateway
 from agentex.adapters.kubernetes.port import KubernetesPort
-from agentex.config.dependencies import DEnvironmentVariables
+from agentex.config.dependencies import DEnvironmentVariables, DKubernetesApiClient, singleton
 from agentex.domain.entities.deployment import Deployment, DeploymentStatus, DeploymentCondition
 from agentex.domain.entities.job import Job, JobStatus, JobCondition
 from agentex.domain.entities.service import Service, ServiceCondition
 from agentex.domain.exceptions import ServiceError
 from agentex.utils.logging import make_logger
+from agentex.utils.metrics import instrument
 
 logger = make_logger(__name__)
 
@@ -24,24 +25,28 @@ class KubernetesError(ServiceError):
     code = 500
 
 
+@instrument("kubernetes")
 class KubernetesGateway(KubernetesPort):
 
     def __init__(
         self,
         http_gateway: DHttpxGateway,
+        api_client: DKubernetesApiClient,
         environment_variables: DEnvironmentVariables,
     ):
         self.http_gateway = http_gateway
+        self.batch_v1 = client.BatchV1Api(api_client)
+        self.apps_v1 = client.AppsV1Api(api_client)
+        self.core_v1 = client.CoreV1Api(api_client)
+        self.policy_v1 = client.PolicyV1Api(api_client)
         self.build_registry_secret_name = environment_variables.BUILD_REGISTRY_SECRET_NAME
 
     async def create_job(self, namespace: str, job: V1Job, override: bool = False) -> Job:
         try:
-            async with ApiClient() as api:
-                batch_v1 = client.BatchV1Api(api)
-                job = await batch_v1.create_namespaced_job(
-                    body=job,
-                    namespace=namespace
-                )
+            job = await self.batch_v1.create_namespaced_job(
+                body=job,
+                namespace=namespace
+            )
             return self._convert_job_to_entity(job)
         except ApiException as error:
             if error.status == 409:
@@ -55,31 +60,25 @@ class KubernetesGateway(KubernetesPort):
 
     async def get_job(self, namespace: str, name: str) -> Optional[Job]:
         try:
-            async with client.ApiClient() as api:
-                batch_v1 = client.BatchV1Api(api)
-                job = await batch_v1.read_namespaced_job(name=name, namespace=namespace)
-                return self._convert_job_to_entity(job)
+            job = await self.batch_v1.read_namespaced_job(name=name, namespace=namespace)
+            return self._convert_job_to_entity(job)
         except ApiException as error:
             if error.status == 404:
                 return None
             raise KubernetesError(f"Error getting job {name}: {error}") from error
 
     async def delete_job(self, namespace: str, name: str) -> None:
-        async with ApiClient() as api:
-            batch_v1 = client.BatchV1Api(api)
-            try:
-                await batch_v1.delete_namespaced_job(name=name, namespace=namespace)
-            except ApiException as error:
-                raise KubernetesError(f"Error deleting job {name}: {error}") from error
+        try:
+            await self.batch_v1.delete_namespaced_job(name=name, namespace=namespace)
+        except ApiException as error:
+            raise KubernetesError(f"Error deleting job {name}: {error}") from error
 
     async def create_deployment(self, namespace: str, deployment: V1Deployment, override: bool = False) -> Deployment:
         try:
-            async with ApiClient() as api:
-                apps_v1 = client.AppsV1Api(api)
-                v1_deployment = await apps_v1.create_namespaced_deployment(
-                    body=deployment,
-                    namespace=namespace
-                )
+            v1_deployment = await self.apps_v1.create_namespaced_deployment(
+                body=deployment,
+                namespace=namespace
+            )
             return self._convert_deploy_to_entity(v1_deployment)
         except ApiException as error:
             if error.status == 409:
@@ -93,22 +92,18 @@ class KubernetesGateway(KubernetesPort):
 
     async def update_deployment(self, namespace: str, deployment: V1Deployment) -> Deployment:
         try:
-            async with ApiClient() as api:
-                apps_v1 = client.AppsV1Api(api)
-                v1_deployment = await apps_v1.patch_namespaced_deployment(
-                    name=deployment.metadata.name,
-                    namespace=namespace,
-                    body=deployment
-                )
+            v1_deployment = await self.apps_v1.patch_namespaced_deployment(
+                name=deployment.metadata.name,
+                namespace=namespace,
+                body=deployment
+            )
             return self._convert_deploy_to_entity(v1_deployment)
         except ApiException as error:
             raise KubernetesError(f"Error updating deployment {deployment.metadata.name}: {error}") from error
 
     async def get_deployment(self, namespace: str, name: str) -> Optional[Deployment]:
         try:
-            async with ApiClient() as api:
-                apps_v1 = client.AppsV1Api(api)
-                v1_deployment = await apps_v1.read_namespaced_deployment(name=name, namespace=namespace)
+            v1_deployment = await self.apps_v1.read_namespaced_deployment(name=name, namespace=namespace)
         except ApiException as error:
             logger.info("Error getting deployment %s: %s", name, error)
             logger.info(f"Status: {error.status}")
@@ -120,22 +115,18 @@ class KubernetesGateway(KubernetesPort):
 
     async def delete_deployment(self, namespace: str, name: str) -> None:
         """Delete the deployment by name."""
-        async with ApiClient() as api:
-            apps_v1 = client.AppsV1Api(api)
-            try:
-                await apps_v1.delete_namespaced_deployment(name=name, namespace=namespace)
-            except ApiException as error:
-                raise KubernetesError(f"Error deleting deployment {name}: {error}") from error
+        try:
+            await self.apps_v1.delete_namespaced_deployment(name=name, namespace=namespace)
+        except ApiException as error:
+            raise KubernetesError(f"Error deleting deployment {name}: {error}") from error
 
     async def create_service(self, namespace: str, service: V1Service, override: bool = False) -> Service:
         # Create the service
         try:
-            async with ApiClient() as api:
-                core_v1 = client.CoreV1Api(api)
-                v1_service = await core_v1.create_namespaced_service(
-                    body=service,
-                    namespace=namespace
-                )
+            v1_service = await self.core_v1.create_namespaced_service(
+                body=service,
+                namespace=namespace
+            )
             return self._convert_service_to_entity(v1_service)
         except ApiException as error:
             if error.status == 409:
@@ -149,23 +140,19 @@ class KubernetesGateway(KubernetesPort):
 
     async def update_service(self, namespace: str, service: V1Service) -> Service:
         try:
-            async with ApiClient() as api:
-                core_v1 = client.CoreV1Api(api)
-                v1_service = await core_v1.patch_namespaced_service(
-                    name=service.metadata.name,
-                    namespace=namespace,
-                    body=service
-                )
+            v1_service = await self.core_v1.patch_namespaced_service(
+                name=service.metadata.name,
+                namespace=namespace,
+                body=service
+            )
             return self._convert_service_to_entity(v1_service)
         except ApiException as error:
             raise KubernetesError(f"Error updating service {service.metadata.name}: {error}") from error
 
     async def get_service(self, namespace: str, name: str) -> Optional[Service]:
         try:
-            async with ApiClient() as api:
-                core_v1 = client.CoreV1Api(api)
-                service = await core_v1.read_namespaced_service(name=name, namespace=namespace)
-                return self._convert_service_to_entity(service)
+            service = await self.core_v1.read_namespaced_service(name=name, namespace=namespace)
+            return self._convert_service_to_entity(service)
         except ApiException as error:
             if error.status == 404:
                 return None
@@ -173,60 +160,46 @@ class KubernetesGateway(KubernetesPort):
 
     async def delete_service(self, namespace: str, name: str) -> None:
         """Delete the service by name."""
-        async with ApiClient() as api:
-            core_v1 = client.CoreV1Api(api)
-            try:
-                await core_v1.delete_namespaced_service(name=name, namespace=namespace)
-            except ApiException as error:
-                raise KubernetesError(f"Error deleting service {name}: {error}") from error
+        try:
+            await self.core_v1.delete_namespaced_service(name=name, namespace=namespace)
+        except ApiException as error:
+            raise KubernetesError(f"Error deleting service {name}: {error}") from error
 
-    @staticmethod
-    async def create_pod_disruption_budget(namespace: str, pdb: V1PodDisruptionBudget) -> None:
-        async with ApiClient() as api:
-            policy_v1 = client.PolicyV1Api(api)
-            try:
-                await policy_v1.create_namespaced_pod_disruption_budget(
-                    namespace=namespace,
-                    body=pdb
-                )
-            except ApiException as error:
-                raise KubernetesError(f"Error creating pod disruption budget {pdb.metadata.name}: {error}") from error
+    async def create_pod_disruption_budget(self, namespace: str, pdb: V1PodDisruptionBudget) -> None:
+        try:
+            await self.policy_v1.create_namespaced_pod_disruption_budget(
+                namespace=namespace,
+                body=pdb
+            )
+        except ApiException as error:
+            raise KubernetesError(f"Error creating pod disruption budget {pdb.metadata.name}: {error}") from error
 
-    @staticmethod
-    async def get_pod_disruption_budget(namespace: str, name: str) -> Optional[V1PodDisruptionBudget]:
-        async with ApiClient() as api:
-            policy_v1 = client.PolicyV1Api(api)
-            try:
-                return await policy_v1.read_namespaced_pod_disruption_budget(name=name, namespace=namespace)
-            except ApiException as error:
-                if error.status == 404:
-                    return None
-                raise KubernetesError(f"Error getting pod disruption budget {name}: {error}") from error
+    async def get_pod_disruption_budget(self, namespace: str, name: str) -> Optional[V1PodDisruptionBudget]:
+        try:
+            return await self.policy_v1.read_namespaced_pod_disruption_budget(name=name, namespace=namespace)
+        except ApiException as error:
+            if error.status == 404:
+                return None
+            raise KubernetesError(f"Error getting pod disruption budget {name}: {error}") from error
 
-    @staticmethod
-    async def update_pod_disruption_budget(namespace: str, pdb: V1PodDisruptionBudget) -> None:
-        async with ApiClient() as api:
-            policy_v1 = client.PolicyV1Api(api)
-            try:
-                await policy_v1.patch_namespaced_pod_disruption_budget(
-                    name=pdb.metadata.name,
-                    namespace=namespace,
-                    body=pdb
-                )
-            except ApiException as error:
-                raise KubernetesError(f"Error updating pod disruption budget {pdb.metadata.name}: {error}") from error
+    async def update_pod_disruption_budget(self, namespace: str, pdb: V1PodDisruptionBudget) -> None:
+        try:
+            await self.policy_v1.patch_namespaced_pod_disruption_budget(
+                name=pdb.metadata.name,
+                namespace=namespace,
+                body=pdb
+            )
+        except ApiException as error:
+            raise KubernetesError(f"Error updating pod disruption budget {pdb.metadata.name}: {error}") from error
 
-    @staticmethod
-    async def delete_pod_disruption_budget(namespace: str, name: str) -> None:
-        async with ApiClient() as api:
-            policy_v1 = client.PolicyV1Api(api)
-            try:
-                await policy_v1.delete_namespaced_pod_disruption_budget(
-                    name=name,
-                    namespace=namespace
-                )
-            except ApiException as error:
-                raise KubernetesError(f"Error deleting pod disruption budget {name}: {error}") from error
+    async def delete_pod_disruption_budget(self, namespace: str, name: str) -> None:
+        try:
+            await self.policy_v1.delete_namespaced_pod_disruption_budget(
+                name=name,
+                namespace=namespace
+            )
+        except ApiException as error:
+            raise KubernetesError(f"Error deleting pod disruption budget {name}: {error}") from error
 
     async def call_service(
         self,
@@ -328,4 +301,4 @@ class KubernetesGateway(KubernetesPort):
         )
 
 
-DKubernetesGateway = Annotated[KubernetesGateway, Depends(KubernetesGateway)]
+DKubernetesGateway = Annotated[KubernetesGateway, Depends(singleton(KubernetesGateway))]
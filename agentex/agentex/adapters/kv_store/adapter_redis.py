@@ -1,18 +1,68 @@
-from typing import Any, Annotated, Optional, List, Dict
+from typing import Any, Annotated, Optional, List, Dict, Tuple
 
-import redis.asyncio as redis
 from fastapi import Depends
 
 from agentex.adapters.kv_store.port import MemoryRepository
-from agentex.config.dependencies import DEnvironmentVariables
+from agentex.config.dependencies import DRedisClient, singleton
+from agentex.utils.metrics import instrument
 
+STREAM_MESSAGE_FIELD = "message"
 
+# Uses the server's clock so that every API replica refills buckets the same way
+TAKE_TOKENS_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+# Leases are members of a sorted set scored by their expiry, so expired leases can be dropped in one call
+ACQUIRE_LEASE_SCRIPT = """
+local holder = ARGV[1]
+local limit = tonumber(ARGV[2])
+local lease_seconds = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if not redis.call('ZSCORE', KEYS[1], holder) and redis.call('ZCARD', KEYS[1]) >= limit then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + lease_seconds, holder)
+local expires_at = redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')[2]
+redis.call('EXPIREAT', KEYS[1], math.ceil(tonumber(expires_at)))
+return 1
+"""
+
+
+@instrument("redis")
 class RedisRepository(MemoryRepository):
-    def __init__(self, environment_variables: DEnvironmentVariables):
-        self.redis = redis.from_url(environment_variables.REDIS_URL)
+    def __init__(self, redis_client: DRedisClient):
+        self.redis = redis_client
+        self._take_tokens = self.redis.register_script(TAKE_TOKENS_SCRIPT)
+        self._acquire_lease = self.redis.register_script(ACQUIRE_LEASE_SCRIPT)
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        return await self.redis.set(key, value, ex=ttl_seconds)
 
-    async def set(self, key: str, value: Any) -> None:
-        return await self.redis.set(key, value)
+    async def set_if_not_exists(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
+        return bool(await self.redis.set(key, value, ex=ttl_seconds, nx=True))
 
     async def batch_set(self, updates: Dict[str, Any]) -> None:
         return await self.redis.mset(updates)
@@ -29,6 +79,20 @@ class RedisRepository(MemoryRepository):
     async def batch_delete(self, keys: List[str]) -> List[Any]:
         return await self.redis.delete(*keys)
 
+    async def take_tokens(self, key: str, rate_per_second: float, capacity: int, tokens: int = 1) -> float:
+        wait = await self._take_tokens(keys=[key], args=[rate_per_second, capacity, tokens])
+        return float(wait)
+
+    async def acquire_lease(self, key: str, holder: str, limit: int, lease_seconds: float) -> bool:
+        return bool(await self._acquire_lease(keys=[key], args=[holder, limit, lease_seconds]))
+
+    async def release_leases(self, key: str, holders: List[str]) -> None:
+        if holders:
+            await self.redis.zrem(key, *holders)
+
+    async def get_lease_holders(self, key: str) -> List[str]:
+        return [holder.decode() for holder in await self.redis.zrange(key, 0, -1)]
+
     async def publish(self, channel: str, message: str) -> None:
         await self.redis.publish(channel, message)
 
@@ -37,5 +101,39 @@ class RedisRepository(MemoryRepository):
         await pubsub.subscribe(channel)
         return pubsub
 
+    async def append_to_stream(
+        self,
+        key: str,
+        message: str,
+        max_length: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> str:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(key, {STREAM_MESSAGE_FIELD: message}, maxlen=max_length, approximate=True)
+            if ttl_seconds is not None:
+                pipe.expire(key, ttl_seconds)
+            message_id, *_ = await pipe.execute()
+        return message_id.decode()
+
+    async def read_stream(
+        self,
+        key: str,
+        after_id: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+        count: Optional[int] = None,
+    ) -> List[Tuple[str, str]]:
+        response = await self.redis.xread(
+            {key: after_id or "0-0"},
+            count=count,
+            block=int(timeout_seconds * 1000) if timeout_seconds is not None else None,
+        )
+        if not response:
+            return []
+        _, entries = response[0]
+        return [
+            (message_id.decode(), fields[STREAM_MESSAGE_FIELD.encode()].decode())
+            for message_id, fields in entries
+        ]
+
 
-DRedisRepository = Annotated[Optional[RedisRepository], Depends(RedisRepository)]
+DRedisRepository = Annotated[Optional[RedisRepository], Depends(singleton(RedisRepository))]
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Annotated, Optional, Dict, List
+from typing import Any, Annotated, Optional, Dict, List, Tuple
 
 from fastapi import Depends
 
@@ -7,7 +7,12 @@ from fastapi import Depends
 class MemoryRepository(ABC):
 
     @abstractmethod
-    async def set(self, key: str, value: Any) -> None:
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_if_not_exists(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
+        """Atomically set the key only if it does not exist yet. Returns whether it was set."""
         raise NotImplementedError
 
     @abstractmethod
@@ -30,6 +35,30 @@ class MemoryRepository(ABC):
     async def batch_delete(self, keys: List[str]) -> List[Any]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def take_tokens(self, key: str, rate_per_second: float, capacity: int, tokens: int = 1) -> float:
+        """
+        Atomically take tokens from a token bucket that refills at `rate_per_second` up to `capacity`. Returns 0
+        if they were taken, otherwise how many seconds to wait until enough tokens are available.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acquire_lease(self, key: str, holder: str, limit: int, lease_seconds: float) -> bool:
+        """
+        Atomically acquire one of `limit` leases on the key for `holder`, expiring after `lease_seconds`.
+        Returns whether it was acquired. Acquiring a lease that the holder already has succeeds.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release_leases(self, key: str, holders: List[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_lease_holders(self, key: str) -> List[str]:
+        raise NotImplementedError
+
     @abstractmethod
     async def publish(self, channel: str, message: str) -> None:
         raise NotImplementedError
@@ -38,5 +67,30 @@ class MemoryRepository(ABC):
     async def subscribe(self, channel: str):
         raise NotImplementedError
 
+    @abstractmethod
+    async def append_to_stream(
+        self,
+        key: str,
+        message: str,
+        max_length: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> str:
+        """Append a message to a stream and return its ID. IDs increase monotonically within a stream."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def read_stream(
+        self,
+        key: str,
+        after_id: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+        count: Optional[int] = None,
+    ) -> List[Tuple[str, str]]:
+        """
+        Read (ID, message) pairs appended to a stream after `after_id`, or from the start of the stream if it is
+        not set. Waits up to `timeout_seconds` for new messages if there are none yet.
+        """
+        raise NotImplementedError
+
 
 DMemoryRepository = Annotated[Optional[MemoryRepository], Depends(MemoryRepository)]
@@ -1,6 +1,4 @@
-from datetime import datetime, timezone
-
-from sqlalchemy import DateTime, Column, String, ForeignKey, Enum as SQLAlchemyEnum, Text
+from sqlalchemy import DateTime, Column, String, ForeignKey, Enum as SQLAlchemyEnum, Text, Index, func, or_
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -13,28 +11,44 @@ BaseORM = declarative_base()
 
 class AgentORM(BaseORM):
     __tablename__ = 'agents'
-    id = Column(String, primary_key=True, default=orm_id)  # Using UUIDs for IDs
+    id = Column(String, primary_key=True, default=orm_id)  # Using time ordered UUIDs for IDs
     name = Column(String, unique=True, nullable=False, index=True)
     description = Column(Text, nullable=False)
     packaging_method = Column(SQLAlchemyEnum(PackagingMethod), nullable=False)
     docker_image = Column(String, nullable=True)
+    package_digest = Column(String, nullable=True)
     status = Column(SQLAlchemyEnum(AgentStatus), nullable=False)
     status_reason = Column(Text, nullable=True)
     build_job_name = Column(String, nullable=True, index=True)
     build_job_namespace = Column(String, default="default", nullable=True)
     workflow_name = Column(String, nullable=False)
     workflow_queue_name = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
 
 class TaskORM(BaseORM):
     __tablename__ = 'tasks'
-    id = Column(String, primary_key=True, default=orm_id)  # Using UUIDs for IDs
+    id = Column(String, primary_key=True, default=orm_id)  # Using time ordered UUIDs for IDs
     agent_id = Column(String, ForeignKey('agents.id'), nullable=False)
     prompt = Column(String, nullable=False)
     agent = relationship("AgentORM")
     status = Column(SQLAlchemyEnum(TaskStatus), nullable=True)
     status_reason = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Listing an agent's tasks in keyset order, and the foreign key check when an agent is deleted
+        Index("ix_tasks_agent_id_created_at_id", "agent_id", "created_at", "id"),
+        # Listing all tasks in keyset order
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # Listing tasks that have not finished, which are few. Their status is only persisted once they finish, so
+        # it is still null.
+        Index(
+            "ix_tasks_non_terminal",
+            "created_at",
+            "id",
+            postgresql_where=or_(status.is_(None), status == TaskStatus.RUNNING),
+        ),
+    )
@@ -1,27 +1,50 @@
+import asyncio
 import sys
 from contextlib import asynccontextmanager
+from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, List
 
-from fastapi import FastAPI, UploadFile, File, Body
+from fastapi import FastAPI, UploadFile, File, Body, Query, Header
 from fastapi import Request
 from fastapi import status
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.exceptions import RequestValidationError, HTTPException
-from starlette.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.responses import JSONResponse, Response, StreamingResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY, HTTP_500_INTERNAL_SERVER_ERROR
 
+from agentex.api.idempotency import DIdempotentRequests
+from agentex.api.middleware import MetricsMiddleware, ReadYourWritesMiddleware, SaturationMiddleware
+from agentex.api.responses import ModelResponse
 from agentex.api.schemas.agents import CreateAgentRequest, AgentModel
-from agentex.api.schemas.tasks import CreateTaskRequest, TaskModel, ModifyTaskRequest
+from agentex.adapters.async_runtime.adapter_temporal import TaskStatus
+from agentex.api.schemas.tasks import CreateTaskRequest, TaskModel, ModifyTaskRequest, BatchCreateTasksRequest, \
+    BatchCreateTasksResponse, BatchGetTasksRequest, BatchGetTasksResponse
 from agentex.config import dependencies
+from agentex.config.environment_variables import EnvironmentVariables
+from agentex.domain.entities.agents import AgentStatus
+from agentex.domain.entities.pagination import Page
+from agentex.domain.entities.tasks import TaskFields
 from agentex.domain.exceptions import GenericException
+from agentex.domain.services.agent_tasks.task_admission import DTaskAdmission
 from agentex.domain.use_cases.agents_use_case import DAgentsUseCase
 from agentex.domain.use_cases.tasks_use_case import DTaskUseCase
+from agentex.utils.etags import etag_matches, make_etag
 from agentex.utils.logging import make_logger
+from agentex.utils.blocking_calls import start_blocking_call_detector, stop_blocking_call_detector
 from agentex.utils.model_utils import BaseModel
+from agentex.utils.saturation import saturation_monitor
+from agentex.utils.uploads import hash_upload
+from agentex.utils import tracing
 
 logger = make_logger(__name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+DEFAULT_RESULT_TIMEOUT_SECONDS = 30
+MAX_RESULT_TIMEOUT_SECONDS = 60
+
 
 class HTTPExceptionWithMessage(HTTPException):
     """
@@ -45,7 +68,16 @@ class HTTPExceptionWithMessage(HTTPException):
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     await dependencies.startup_global_dependencies()
+    environment_variables = dependencies.GlobalDependencies().environment_variables
+    saturation_monitor.start(sample_interval_seconds=environment_variables.EVENT_LOOP_LAG_SAMPLE_INTERVAL_SECONDS)
+    if environment_variables.BLOCKING_CALL_DETECTION_ENABLED:
+        start_blocking_call_detector(threshold_seconds=environment_variables.BLOCKING_CALL_THRESHOLD_SECONDS)
+    # Warm up in the background, so that the app answers liveness probes while /readyz reports it is not ready
+    warm_up = asyncio.create_task(dependencies.warm_up_global_dependencies())
     yield
+    warm_up.cancel()
+    saturation_monitor.stop()
+    stop_blocking_call_detector()
     await dependencies.async_shutdown()
     dependencies.shutdown()
 
@@ -61,13 +93,20 @@ app = FastAPI(
     root_path_in_servers=False,
     lifespan=lifespan
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(SaturationMiddleware)
+# Added last so it is outermost, and also times the requests that are shed
+app.add_middleware(MetricsMiddleware)
+# Instrumenting adds middleware, which has to happen before the app starts
+tracing.configure_tracing(service_name="agentex-api", environment_variables=EnvironmentVariables.refresh())
+tracing.instrument_app(app)
 
 
 @app.exception_handler(Exception)
 async def custom_exception_handler(request: Request, error: Exception):
     logger.error("Unhandled exception caught by route handler", exc_info=sys.exc_info())
     if isinstance(error, GenericException):
-        http_error = HTTPExceptionWithMessage(status_code=error.code, detail=error.message)
+        http_error = HTTPExceptionWithMessage(status_code=error.code, detail=error.message, headers=error.headers)
     elif isinstance(error, RequestValidationError):
         # RequestValidationError is thrown by the FastAPI schema validation middleware
         http_error = HTTPExceptionWithMessage(
@@ -102,7 +141,7 @@ def healthcheck() -> Response:
     return Response(status_code=status.HTTP_200_OK)
 
 
-health_check_urls = ["healthcheck", "healthz", "readyz"]
+health_check_urls = ["healthcheck", "healthz"]
 for health_check_url in health_check_urls:
     app.get(
         path=f"/{health_check_url}",
@@ -111,11 +150,32 @@ for health_check_url in health_check_urls:
     )(healthcheck)
 
 
+@app.get(path="/readyz", operation_id="readyz", include_in_schema=False)
+def readiness() -> Response:
+    """
+    Returns 200 if the app can take traffic, or 503 with the reasons if it has not warmed up its connections yet
+    or is saturated, so that traffic shifts to other replicas until it recovers.
+    """
+    global_dependencies = dependencies.GlobalDependencies()
+    if not global_dependencies.ready:
+        reasons = ["Warming up connections"]
+    else:
+        reasons = saturation_monitor.saturation_reasons(global_dependencies.environment_variables)
+    if reasons:
+        return JSONResponse({"ready": False, "reasons": reasons}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response(status_code=status.HTTP_200_OK)
+
+
 @app.get(path="/")
 async def root():
     return {"message": "Welcome to Agentex!"}
 
 
+@app.get(path="/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 class EchoMessage(BaseModel):
     message: str
 
@@ -132,18 +192,37 @@ async def echo(request: EchoMessage):
 )
 async def create_agent(
     agents_use_case: DAgentsUseCase,
+    idempotent_requests: DIdempotentRequests,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        description="Unique key for this request. Retries with the same key return the original response instead "
+                    "of building the agent again.",
+    ),
     agent_package: UploadFile = File(...),
     request: CreateAgentRequest = Body(...),
-) -> AgentModel:
+) -> Response:
     logger.info(f"Creating agent: {request}")
-    agent = await agents_use_case.create(
-        agent_package=agent_package,
-        name=request.name,
-        description=request.description,
-        workflow_name=request.workflow_name,
-        workflow_queue_name=request.workflow_queue_name,
+
+    async def create() -> Response:
+        agent = await agents_use_case.create(
+            agent_package=agent_package,
+            name=request.name,
+            description=request.description,
+            workflow_name=request.workflow_name,
+            workflow_queue_name=request.workflow_queue_name,
+        )
+        return ModelResponse(AgentModel.from_orm(agent))
+
+    # Only retries of the same package may reuse a key, so the package's content is part of the fingerprint. It is
+    # only hashed when there is a key to check it against.
+    package_sha256 = await asyncio.to_thread(hash_upload, agent_package.file) if idempotency_key is not None else None
+    return await idempotent_requests.run(
+        scope="create_agent",
+        idempotency_key=idempotency_key,
+        request_fingerprint=f"{request.to_json()}:{package_sha256}",
+        handler=create,
     )
-    return AgentModel.from_orm(agent)
 
 
 @app.get(
@@ -154,21 +233,41 @@ async def create_agent(
 async def get_agent(
     agent_id: str,
     agents_use_case: DAgentsUseCase,
+    if_none_match: Optional[str] = Header(None),
 ):
-    agent = await agents_use_case.get(id=agent_id)
-    return AgentModel.from_orm(agent)
+    agent = await agents_use_case.get(id=agent_id, name=None)
+    etag = make_etag(agent.to_json())
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return ModelResponse(AgentModel.from_orm(agent), headers={"ETag": etag})
 
 
 @app.get(
     path="/agents",
-    response_model=List[AgentModel],
+    response_model=Page[AgentModel],
     tags=[RouteTag.AGENTS],
 )
 async def list_agents(
     agents_use_case: DAgentsUseCase,
-):
-    agents = await agents_use_case.list()
-    return [AgentModel.from_orm(agent) for agent in agents]
+    status: Optional[List[AgentStatus]] = Query(None, description="Only return agents in these statuses."),
+    created_after: Optional[datetime] = Query(None, description="Only return agents created at or after this time."),
+    created_before: Optional[datetime] = Query(None, description="Only return agents created before this time."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="The maximum number of agents to return."),
+    cursor: Optional[str] = Query(None, description="The `next_cursor` returned by the previous page."),
+) -> Response:
+    page = await agents_use_case.list(
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
+        limit=limit,
+        cursor=cursor,
+    )
+    return ModelResponse(
+        Page[AgentModel](
+            items=[AgentModel.from_orm(agent) for agent in page.items],
+            next_cursor=page.next_cursor,
+        )
+    )
 
 
 @app.delete(
@@ -181,7 +280,7 @@ async def delete_agent(
     agents_use_case: DAgentsUseCase,
 ):
     agent = await agents_use_case.delete(name=agent_name)
-    return AgentModel.from_orm(agent)
+    return ModelResponse(AgentModel.from_orm(agent))
 
 
 @app.post(
@@ -191,14 +290,135 @@ async def delete_agent(
 )
 async def create_task(
     request: CreateTaskRequest,
+    http_request: Request,
+    task_use_case: DTaskUseCase,
+    task_admission: DTaskAdmission,
+    idempotent_requests: DIdempotentRequests,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        description="Unique key for this request. Retries with the same key return the original response instead "
+                    "of creating the task again.",
+    ),
+    api_key: Optional[str] = Header(
+        None,
+        alias="X-API-Key",
+        description="Identifies the client for rate limiting. Requests without it are limited by client address.",
+    ),
+) -> Response:
+    async def create() -> Response:
+        await task_admission.check_rate_limits(
+            client_id=_client_id(http_request, api_key),
+            agent_names=[request.agent_name],
+        )
+        task = await task_use_case.create(
+            agent_name=request.agent_name,
+            prompt=request.prompt,
+            require_approval=request.require_approval,
+        )
+        return ModelResponse(TaskModel.from_orm(task))
+
+    return await idempotent_requests.run(
+        scope="create_task",
+        idempotency_key=idempotency_key,
+        request_fingerprint=request.to_json(),
+        handler=create,
+    )
+
+
+def _client_id(http_request: Request, api_key: Optional[str]) -> Optional[str]:
+    if api_key:
+        return api_key
+    return http_request.client.host if http_request.client else None
+
+
+@app.post(
+    "/tasks:batch",
+    response_model=BatchCreateTasksResponse,
+    tags=[RouteTag.TASKS],
+)
+async def batch_create_tasks(
+    request: BatchCreateTasksRequest,
+    http_request: Request,
     task_use_case: DTaskUseCase,
-) -> TaskModel:
-    task = await task_use_case.create(
-        agent_name=request.agent_name,
-        prompt=request.prompt,
-        require_approval=request.require_approval,
+    task_admission: DTaskAdmission,
+    idempotent_requests: DIdempotentRequests,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        description="Unique key for this request. Retries with the same key return the original response instead "
+                    "of creating the tasks again.",
+    ),
+    api_key: Optional[str] = Header(
+        None,
+        alias="X-API-Key",
+        description="Identifies the client for rate limiting. Requests without it are limited by client address.",
+    ),
+) -> Response:
+    async def create() -> Response:
+        await task_admission.check_rate_limits(
+            client_id=_client_id(http_request, api_key),
+            agent_names=[task.agent_name for task in request.tasks],
+        )
+        results = await task_use_case.batch_create(requests=request.tasks)
+        return ModelResponse(BatchCreateTasksResponse(results=results))
+
+    return await idempotent_requests.run(
+        scope="batch_create_tasks",
+        idempotency_key=idempotency_key,
+        request_fingerprint=request.to_json(),
+        handler=create,
     )
-    return TaskModel.from_orm(task)
+
+
+@app.post(
+    "/tasks:batchGet",
+    response_model=BatchGetTasksResponse,
+    tags=[RouteTag.TASKS],
+)
+async def batch_get_tasks(
+    request: BatchGetTasksRequest,
+    task_use_case: DTaskUseCase,
+) -> Response:
+    tasks = await task_use_case.batch_get(
+        task_ids=request.ids,
+        fields=TaskFields.parse(request.fields) if request.fields else None,
+    )
+    return ModelResponse(BatchGetTasksResponse(tasks=tasks), exclude_unset=True)
+
+
+@app.get(
+    "/tasks/export",
+    response_class=StreamingResponse,
+    tags=[RouteTag.TASKS],
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_tasks(
+    task_use_case: DTaskUseCase,
+    agent_id: Optional[str] = Query(None, description="Only export tasks run by the agent with this ID."),
+    agent_name: Optional[str] = Query(None, description="Only export tasks run by the agent with this name."),
+    status: Optional[List[TaskStatus]] = Query(None, description="Only export tasks in these statuses."),
+    created_after: Optional[datetime] = Query(None, description="Only export tasks created at or after this time."),
+    created_before: Optional[datetime] = Query(None, description="Only export tasks created before this time."),
+) -> StreamingResponse:
+    """
+    Stream every matching task as newline-delimited JSON, ordered by creation time. Each task includes its
+    `created_at` and `updated_at`. To continue an export, pass the last task's `created_at` as `created_after`
+    and skip the tasks already received, since tasks created at that same time are exported again.
+    """
+    tasks = await task_use_case.export(
+        agent_id=agent_id,
+        agent_name=agent_name,
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
+    )
+
+    async def ndjson_lines():
+        async for task in tasks:
+            yield task.to_json() + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 @app.get(
@@ -209,21 +429,118 @@ async def create_task(
 async def get_task(
     task_id: str,
     task_use_case: DTaskUseCase,
-) -> TaskModel:
-    get_task_response = await task_use_case.get(task_id)
-    return get_task_response
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[List[str]] = Query(
+        None,
+        description="The parts of the task to return, e.g. `status`, `context`, `threads` or `threads.<name>`. "
+                    "May be repeated or comma separated. Defaults to the whole task.",
+    ),
+) -> Response:
+    etag, get_task_response = await task_use_case.get_if_changed(
+        task_id,
+        fields=TaskFields.parse(fields) if fields else None,
+        if_none_match=if_none_match,
+    )
+    if get_task_response is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return ModelResponse(get_task_response, headers={"ETag": etag}, exclude_unset=True)
 
 
 @app.get(
     path="/tasks",
-    response_model=List[TaskModel],
+    response_model=Page[TaskModel],
     tags=[RouteTag.TASKS],
 )
 async def list_tasks(
     task_use_case: DTaskUseCase,
-):
-    tasks = await task_use_case.list()
-    return [TaskModel.from_orm(task) for task in tasks]
+    agent_id: Optional[str] = Query(None, description="Only return tasks run by the agent with this ID."),
+    agent_name: Optional[str] = Query(None, description="Only return tasks run by the agent with this name."),
+    status: Optional[List[TaskStatus]] = Query(None, description="Only return tasks in these statuses."),
+    created_after: Optional[datetime] = Query(None, description="Only return tasks created at or after this time."),
+    created_before: Optional[datetime] = Query(None, description="Only return tasks created before this time."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="The maximum number of tasks to return."),
+    cursor: Optional[str] = Query(None, description="The `next_cursor` returned by the previous page."),
+    fields: Optional[List[str]] = Query(
+        None,
+        description="The parts of the task to return, e.g. `status`, `context`, `threads` or `threads.<name>`. "
+                    "May be repeated or comma separated. Defaults to the task row alone, without its status refreshed from the workflow.",
+    ),
+) -> Response:
+    page = await task_use_case.list(
+        agent_id=agent_id,
+        agent_name=agent_name,
+        status=status,
+        created_after=created_after,
+        created_before=created_before,
+        limit=limit,
+        cursor=cursor,
+        fields=TaskFields.parse(fields) if fields else None,
+    )
+    return ModelResponse(page, exclude_unset=True)
+
+
+@app.get(
+    "/tasks/{task_id}/events",
+    response_class=StreamingResponse,
+    tags=[RouteTag.TASKS],
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_task_events(
+    task_id: str,
+    task_use_case: DTaskUseCase,
+    last_event_id_header: Optional[str] = Header(
+        None,
+        alias="Last-Event-ID",
+        description="Resume the stream after this event. Sent automatically by EventSource clients on reconnect.",
+    ),
+    last_event_id: Optional[str] = Query(
+        None,
+        description="Resume the stream after this event, for clients that cannot set the `Last-Event-ID` header.",
+    ),
+) -> StreamingResponse:
+    """
+    Stream the task's status changes and new messages as Server-Sent Events. The stream ends once the task has
+    finished and all of its events have been sent.
+    """
+    events = await task_use_case.events(task_id=task_id, last_event_id=last_event_id_header or last_event_id)
+
+    async def server_sent_events():
+        async for event in events:
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            if event.id is not None:
+                yield f"id: {event.id}\n"
+            yield f"event: {event.type.value}\ndata: {event.to_json(exclude={'id'})}\n\n"
+
+    return StreamingResponse(
+        server_sent_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get(
+    "/tasks/{task_id}/result",
+    response_model=TaskModel,
+    tags=[RouteTag.TASKS],
+    responses={202: {"description": "The task was still running at the timeout. Call again to keep waiting."}},
+)
+async def get_task_result(
+    task_id: str,
+    task_use_case: DTaskUseCase,
+    timeout: float = Query(
+        DEFAULT_RESULT_TIMEOUT_SECONDS,
+        ge=0,
+        le=MAX_RESULT_TIMEOUT_SECONDS,
+        description="How long to wait for the task to finish, in seconds.",
+    ),
+) -> Response:
+    """Wait for the task to finish and return it, or respond with 202 if it is still running at the timeout."""
+    task = await task_use_case.wait_for_result(task_id=task_id, timeout_seconds=timeout)
+    if task is None:
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+    return ModelResponse(task)
 
 
 @app.delete(
@@ -234,9 +551,9 @@ async def list_tasks(
 async def delete_task(
     task_id: str,
     task_use_case: DTaskUseCase,
-) -> TaskModel:
+) -> Response:
     task = await task_use_case.delete(id=task_id)
-    return TaskModel.from_orm(task)
+    return ModelResponse(TaskModel.from_orm(task))
 
 
 @app.post(
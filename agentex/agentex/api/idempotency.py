@@ -0,0 +1,135 @@
+import asyncio
+import hashlib
+import time
+from typing import Annotated, Awaitable, Callable, Optional
+
+from fastapi import Depends
+from starlette.responses import Response
+
+from agentex.adapters.kv_store.adapter_redis import DRedisRepository
+from agentex.config.dependencies import DEnvironmentVariables
+from agentex.domain.exceptions import ClientError
+from agentex.utils.logging import make_logger
+from agentex.utils.model_utils import BaseModel
+
+logger = make_logger(__name__)
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_POLL_INTERVAL_SECONDS = 0.1
+IDEMPOTENT_REPLAY_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyKeyInUseError(ClientError):
+    """
+    Exception raised when a request with the same idempotency key is still in flight.
+    """
+
+    code = 409
+
+
+class IdempotencyKeyReusedError(ClientError):
+    """
+    Exception raised when an idempotency key is reused for a different request.
+    """
+
+    code = 422
+
+
+class IdempotencyRecord(BaseModel):
+    fingerprint: str
+    # Not set while the first request with the key is still in flight
+    status_code: Optional[int] = None
+    media_type: Optional[str] = None
+    body: Optional[str] = None
+
+
+class IdempotentRequests:
+    """
+    Runs requests at most once per idempotency key and replays the stored response for repeats.
+
+    The first request with a key claims it with an atomic SET NX, so concurrent duplicates wait for its result
+    instead of running again. Only successful responses are stored. If the first request fails, the key is
+    released so that the client can retry.
+    """
+
+    def __init__(self, memory_repo: DRedisRepository, environment_variables: DEnvironmentVariables):
+        self.memory_repo = memory_repo
+        self.key_ttl_seconds = environment_variables.IDEMPOTENCY_KEY_TTL_SECONDS
+        self.lock_ttl_seconds = environment_variables.IDEMPOTENCY_LOCK_TTL_SECONDS
+        self.wait_seconds = environment_variables.IDEMPOTENCY_WAIT_SECONDS
+
+    async def run(
+        self,
+        scope: str,
+        idempotency_key: Optional[str],
+        request_fingerprint: str,
+        handler: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """
+        Run `handler` unless a request with the same `scope` and `idempotency_key` already ran, in which case its
+        response is returned. `request_fingerprint` identifies the request payload, so that a key reused for a
+        different request is rejected rather than answered with an unrelated response.
+        """
+        if idempotency_key is None:
+            return await handler()
+        if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise ClientError(f"Idempotency-Key must be between 1 and {IDEMPOTENCY_KEY_MAX_LENGTH} characters.")
+
+        key = f"idempotency:{scope}:{idempotency_key}"
+        fingerprint = hashlib.sha256(request_fingerprint.encode()).hexdigest()
+
+        # Claim the key, or wait for whoever holds it to finish. If they fail, the key is released and claimed here.
+        deadline = time.monotonic() + self.wait_seconds
+        while not await self.memory_repo.set_if_not_exists(
+            key,
+            IdempotencyRecord(fingerprint=fingerprint).to_json(),
+            ttl_seconds=self.lock_ttl_seconds,
+        ):
+            stored_response = await self._stored_response(key=key, fingerprint=fingerprint)
+            if stored_response is not None:
+                return stored_response
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInUseError(
+                    "A request with this Idempotency-Key is still in progress. Retry the request later."
+                )
+            await asyncio.sleep(IDEMPOTENCY_POLL_INTERVAL_SECONDS)
+
+        try:
+            response = await handler()
+        except BaseException:
+            await self.memory_repo.delete(key)
+            raise
+
+        if 200 <= response.status_code < 300:
+            await self.memory_repo.set(
+                key,
+                IdempotencyRecord(
+                    fingerprint=fingerprint,
+                    status_code=response.status_code,
+                    media_type=response.media_type,
+                    body=response.body.decode(),
+                ).to_json(),
+                ttl_seconds=self.key_ttl_seconds,
+            )
+        else:
+            await self.memory_repo.delete(key)
+        return response
+
+    async def _stored_response(self, key: str, fingerprint: str) -> Optional[Response]:
+        """The stored response for the key, or None if the request holding the key has not finished."""
+        record = IdempotencyRecord.from_json(await self.memory_repo.get(key))
+        if record is None:
+            return None
+        if record.fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError("Idempotency-Key was already used for a different request.")
+        if record.status_code is None:
+            return None
+        return Response(
+            content=record.body,
+            status_code=record.status_code,
+            media_type=record.media_type,
+            headers={IDEMPOTENT_REPLAY_HEADER: "true"},
+        )
+
+
+DIdempotentRequests = Annotated[IdempotentRequests, Depends(IdempotentRequests)]
@@ -1,16 +1,27 @@
 import sys
+import time
 from typing import Optional, Dict
 
 from fastapi import Request
 from fastapi.exception_handlers import http_exception_handler
 from fastapi.exceptions import RequestValidationError, HTTPException
-from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY, HTTP_500_INTERNAL_SERVER_ERROR
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY, HTTP_500_INTERNAL_SERVER_ERROR, HTTP_503_SERVICE_UNAVAILABLE
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from agentex.adapters.crud_store.adapter_postgres import read_your_writes
+from agentex.config.environment_variables import EnvironmentVariables
 from agentex.domain.exceptions import GenericException
 from agentex.utils.logging import make_logger
+from agentex.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from agentex.utils.saturation import saturation_monitor
 
 logger = make_logger(__name__)
 
+# Probes and scrapes must keep working while the app is saturated, and do not count as load
+INFRASTRUCTURE_PATHS = {"/healthcheck", "/healthz", "/readyz", "/metrics"}
+
 
 class HTTPExceptionWithMessage(HTTPException):
     """
@@ -34,7 +45,7 @@ class HTTPExceptionWithMessage(HTTPException):
 async def custom_exception_handler(request: Request, error: Exception):
     logger.error("Unhandled exception caught by route handler", exc_info=sys.exc_info())
     if isinstance(error, GenericException):
-        http_error = HTTPExceptionWithMessage(status_code=error.code, detail=error.message)
+        http_error = HTTPExceptionWithMessage(status_code=error.code, detail=error.message, headers=error.headers)
     elif isinstance(error, RequestValidationError):
         # RequestValidationError is thrown by the FastAPI schema validation middleware
         http_error = HTTPExceptionWithMessage(
@@ -56,3 +67,103 @@ async def custom_exception_handler(request: Request, error: Exception):
         exc_info=sys.exc_info(),
     )
     return await http_exception_handler(request, http_error)
+
+
+class MetricsMiddleware:
+    """
+    Records the duration and number of in-flight HTTP requests per route.
+
+    Requests are labelled with the route's path template rather than the request path, so that
+    `/tasks/{task_id}` is one series instead of one per task. This is a pure ASGI middleware, so
+    streaming responses are timed until their last chunk is sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status_code = HTTP_500_INTERNAL_SERVER_ERROR
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method=method, route=route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(method=method, route=route, status_code=str(status_code)).observe(
+                time.perf_counter() - start
+            )
+
+    @staticmethod
+    def _route_template(scope: Scope) -> str:
+        # Unmatched paths share one label so that scanners cannot create a series per path
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "unmatched"
+
+
+class SaturationMiddleware:
+    """
+    Counts in-flight requests for the saturation monitor and, if load shedding is enabled, rejects requests with
+    503 while the app is saturated, so that clients retry against a healthy replica instead of queueing here.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.environment_variables = EnvironmentVariables.refresh()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in INFRASTRUCTURE_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if self.environment_variables.LOAD_SHEDDING_ENABLED:
+            reasons = saturation_monitor.saturation_reasons(self.environment_variables)
+            if reasons:
+                logger.warning(f"Shedding request to {scope['path']}: {'; '.join(reasons)}")
+                response = JSONResponse(
+                    {"detail": "Server is overloaded. Retry the request later."},
+                    status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={"Retry-After": "1"},
+                )
+                await response(scope, receive, send)
+                return
+
+        saturation_monitor.in_flight_requests += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            saturation_monitor.in_flight_requests -= 1
+
+
+class ReadYourWritesMiddleware:
+    """
+    Scopes read-your-writes to each request, if READ_YOUR_WRITES_SECONDS is set, so that reads made after a write in
+    the same request go to the primary even if the write was made in another task.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.enabled = EnvironmentVariables.refresh().READ_YOUR_WRITES_SECONDS is not None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with read_your_writes():
+            await self.app(scope, receive, send)
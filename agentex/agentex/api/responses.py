@@ -0,0 +1,33 @@
+from typing import Mapping, Optional
+
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+from agentex.utils.model_utils import BaseModel
+
+
+class ModelResponse(Response):
+    """
+    JSON response rendered straight from a pydantic model with `model_dump_json`.
+
+    Returning a Response from a route makes FastAPI skip validating the return value against the route's
+    `response_model` and encoding it with `jsonable_encoder`, so the body is serialized exactly once by
+    pydantic's Rust serializer. The route's `response_model` is still used for the OpenAPI schema, so the
+    model passed in here must already be of that type.
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        exclude_unset: bool = False,
+        background: Optional[BackgroundTask] = None,
+    ):
+        # Set before calling super().__init__(), which renders the body
+        self.exclude_unset = exclude_unset
+        super().__init__(content=content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content, exclude_unset=self.exclude_unset)
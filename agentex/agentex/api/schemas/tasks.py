@@ -1,4 +1,4 @@
-from typing import Union, Annotated, Optional
+from typing import Union, Annotated, Optional, List
 
 from pydantic import Field
 
@@ -29,7 +29,62 @@ class TaskModel(Task, AgentState):
     pass
 
 
+MAX_BATCH_SIZE = 1000
+
+
+class BatchCreateTasksRequest(BaseModel):
+    tasks: List[CreateTaskRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        title="The tasks to create",
+    )
+
+
+class BatchCreateTaskResult(BaseModel):
+    index: int = Field(
+        ...,
+        title="The position of the corresponding task in the request",
+    )
+    task: Optional[TaskModel] = Field(
+        None,
+        title="The created task. Not set if the task could not be created",
+    )
+    error: Optional[str] = Field(
+        None,
+        title="Why the task could not be created or started. Not set if the task was submitted",
+    )
+
+
+class BatchCreateTasksResponse(BaseModel):
+    results: List[BatchCreateTaskResult] = Field(
+        ...,
+        title="One result per requested task, in request order",
+    )
+
+
 ModifyTaskRequest = Annotated[
     Union[ApproveTaskRequest, CancelTaskRequest, InstructTaskRequest],
     Field(discriminator="type")
 ]
+
+
+class BatchGetTasksRequest(BaseModel):
+    ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        title="The IDs of the tasks to get",
+    )
+    fields: Optional[List[str]] = Field(
+        None,
+        title="The parts of each task to return, e.g. `status`, `context`, `threads` or `threads.<name>`. "
+              "Defaults to the whole task",
+    )
+
+
+class BatchGetTasksResponse(BaseModel):
+    tasks: List[TaskModel] = Field(
+        ...,
+        title="The tasks that were found, in request order. Tasks that do not exist are omitted",
+    )
@@ -1,19 +1,30 @@
 import asyncio
-from typing import Annotated, Optional
+import functools
+import inspect
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, Annotated, Callable, Optional, Type, TypeVar
 
-from docker import DockerClient
+import httpx
+import redis.asyncio as redis
 from fastapi import Depends
-from kubernetes_asyncio import config as k8s_config
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine, create_async_engine
 from temporalio.client import Client as TemporalClient
 
 from agentex.config.environment_variables import EnvironmentVariables, Environment
 from agentex.utils.database import async_db_engine_creator
 from agentex.utils.logging import make_logger
+from agentex.utils import tracing
 from agentex.utils.temporal_client import get_temporal_client
 
+if TYPE_CHECKING:
+    # Slow to import and only needed by the processes that use them, so they are imported on first use
+    from docker import DockerClient
+    from kubernetes_asyncio.client import ApiClient
+
 logger = make_logger(__name__)
 
+T = TypeVar("T")
+
 
 class Singleton(type):
     _instances = {}
@@ -30,8 +41,13 @@ class GlobalDependencies(metaclass=Singleton):
         self.environment_variables: EnvironmentVariables = EnvironmentVariables.refresh()
         self.temporal_client: Optional[TemporalClient] = None
         self.database_async_read_write_engine: Optional[AsyncEngine] = None
+        self.database_async_read_only_engine: Optional[AsyncEngine] = None
+        self.redis_client: Optional[redis.Redis] = None
+        self.kubernetes_api_client: Optional["ApiClient"] = None
+        self.http_client: Optional[httpx.AsyncClient] = None
         self.docker_client = None
-        # self.database_async_read_only_engine: Optional[AsyncEngine] = None
+        # Set once connections have been warmed up, after which the process reports ready
+        self.ready = False
 
     async def create_temporal_client(self):
         if self.environment_variables.TEMPORAL_ADDRESS in [
@@ -45,22 +61,20 @@ class GlobalDependencies(metaclass=Singleton):
             return None
         else:
             return await get_temporal_client(
-                self.environment_variables.TEMPORAL_ADDRESS
+                self.environment_variables.TEMPORAL_ADDRESS,
+                interceptors=tracing.temporal_interceptors(),
             )
 
     async def load(self):
         self.environment_variables = EnvironmentVariables.refresh()
 
-        try:
-            self.temporal_client = await self.create_temporal_client()
-        except Exception as e:
-            logger.error(f"Failed to initialize temporal client: {e}")
-            self.temporal_client = None
+        # Temporal is the only client that connects on creation, so connect while the others are set up
+        temporal_client = asyncio.create_task(self.create_temporal_client())
 
         self.docker_client = None
 
         echo_db_engine = self.environment_variables.ENV == Environment.DEV
-        async_db_pool_size = 10
+        async_db_pool_size = self.environment_variables.DATABASE_POOL_SIZE
 
         # https://docs.sqlalchemy.org/en/20/core/engines.html#sqlalchemy.create_engine
         self.database_async_read_write_engine = create_async_engine(
@@ -72,19 +86,95 @@ class GlobalDependencies(metaclass=Singleton):
             pool_size=async_db_pool_size,
             pool_pre_ping=True,
         )
+        tracing.instrument_database_engine(self.database_async_read_write_engine)
+
+        if self.environment_variables.READ_ONLY_DATABASE_URL:
+            self.database_async_read_only_engine = create_async_engine(
+                "postgresql+asyncpg://",
+                async_creator=async_db_engine_creator(
+                    self.environment_variables.READ_ONLY_DATABASE_URL,
+                ),
+                echo=echo_db_engine,
+                pool_size=self.environment_variables.READ_ONLY_DATABASE_POOL_SIZE,
+                pool_pre_ping=True,
+            )
+            tracing.instrument_database_engine(self.database_async_read_only_engine)
+        else:
+            # Without a replica, reads share the primary's engine and pool
+            self.database_async_read_only_engine = self.database_async_read_write_engine
+
+        # Connections are opened lazily, so creating the pool does not need Redis to be up
+        self.redis_client = redis.from_url(
+            self.environment_variables.REDIS_URL,
+            max_connections=self.environment_variables.REDIS_MAX_CONNECTIONS,
+        )
 
-        # Load Kubernetes configuration (local or in-cluster)
-        k8s_config.load_incluster_config()
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.environment_variables.HTTP_MAX_CONNECTIONS),
+        )
+
+        try:
+            self.temporal_client = await temporal_client
+        except Exception as e:
+            logger.error(f"Failed to initialize temporal client: {e}")
+            self.temporal_client = None
 
-        # self.database_async_read_only_engine = create_async_engine(
-        #     "postgresql+asyncpg://",
-        #     async_creator=async_db_engine_creator(
-        #         self.environment_variables.READ_ONLY_DATABASE_URL,
-        #     ),
-        #     echo=echo_db_engine,
-        #     pool_size=async_db_pool_size,
-        #     pool_pre_ping=True,
-        # )
+    async def warm_up(self):
+        """
+        Open database and Redis connections ahead of the first requests, so that they do not pay for connection
+        setup, then mark the process ready. Failures are logged rather than raised, since requests open the
+        connections they need anyway.
+        """
+        warm_ups = [
+            self._warm_up_database(
+                name="primary",
+                engine=self.database_async_read_write_engine,
+                pool_size=self.environment_variables.DATABASE_POOL_SIZE,
+                connections=self.environment_variables.DATABASE_WARM_CONNECTIONS,
+            ),
+            self._warm_up_redis(self.environment_variables.REDIS_WARM_CONNECTIONS),
+        ]
+        if self.database_async_read_only_engine is not self.database_async_read_write_engine:
+            warm_ups.append(self._warm_up_database(
+                name="read replica",
+                engine=self.database_async_read_only_engine,
+                pool_size=self.environment_variables.READ_ONLY_DATABASE_POOL_SIZE,
+                connections=self.environment_variables.DATABASE_WARM_CONNECTIONS,
+            ))
+        results = await asyncio.gather(*warm_ups, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to warm up connections: {result}")
+        self.ready = True
+
+    @staticmethod
+    async def _warm_up_database(name: str, engine: AsyncEngine, pool_size: int, connections: int):
+        # Connections have to be held at the same time, or the pool would hand out the same one each time
+        connections = min(connections, pool_size)
+        async with AsyncExitStack() as stack:
+            await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(connections)))
+        logger.info(f"Opened {connections} connections to the {name} database")
+
+    async def _warm_up_redis(self, connections: int):
+        pool = self.redis_client.connection_pool
+        opened = await asyncio.gather(*(pool.get_connection("PING") for _ in range(connections)))
+        await asyncio.gather(*(pool.release(connection) for connection in opened))
+        logger.info(f"Opened {connections} Redis connections")
+
+    async def get_kubernetes_api_client(self) -> "ApiClient":
+        """
+        The Kubernetes client is created on first use rather than in `load`, because only the worker talks to
+        Kubernetes and importing the client takes a noticeable part of startup.
+        """
+        if self.kubernetes_api_client is None:
+            from kubernetes_asyncio import client as k8s_client, config as k8s_config
+
+            # Load Kubernetes configuration (local or in-cluster)
+            k8s_config.load_incluster_config()
+            k8s_configuration = k8s_client.Configuration.get_default_copy()
+            k8s_configuration.connection_pool_maxsize = self.environment_variables.KUBERNETES_MAX_CONNECTIONS
+            self.kubernetes_api_client = k8s_client.ApiClient(configuration=k8s_configuration)
+        return self.kubernetes_api_client
 
 
 async def startup_global_dependencies():
@@ -92,17 +182,29 @@ async def startup_global_dependencies():
     await global_dependencies.load()
 
 
+async def warm_up_global_dependencies():
+    await GlobalDependencies().warm_up()
+
+
 def shutdown():
-    pass
+    tracing.shutdown_tracing()
 
 
 async def async_shutdown():
     global_dependencies = GlobalDependencies()
     run_concurrently = []
-    # if global_dependencies.database_async_read_only_engine:
-    #     run_concurrently.append(global_dependencies.database_async_read_only_engine.dispose())
+    if global_dependencies.database_async_read_only_engine not in (
+        None, global_dependencies.database_async_read_write_engine
+    ):
+        run_concurrently.append(global_dependencies.database_async_read_only_engine.dispose())
     if global_dependencies.database_async_read_write_engine:
         run_concurrently.append(global_dependencies.database_async_read_write_engine.dispose())
+    if global_dependencies.redis_client:
+        run_concurrently.append(global_dependencies.redis_client.aclose())
+    if global_dependencies.http_client:
+        run_concurrently.append(global_dependencies.http_client.aclose())
+    if global_dependencies.kubernetes_api_client:
+        run_concurrently.append(global_dependencies.kubernetes_api_client.close())
     await asyncio.gather(*run_concurrently)
 
 
@@ -128,16 +230,17 @@ def database_async_read_write_engine() -> AsyncEngine:
     return GlobalDependencies().database_async_read_write_engine
 
 
-# def database_async_read_only_engine() -> AsyncEngine:
-#     return GlobalDependencies().database_async_read_only_engine
+def database_async_read_only_engine() -> AsyncEngine:
+    return GlobalDependencies().database_async_read_only_engine
 
 
 DDatabaseAsyncReadWriteEngine = Annotated[AsyncEngine, Depends(database_async_read_write_engine)]
 
 
-# DDatabaseAsyncReadOnlyEngine = Annotated[AsyncEngine, Depends(database_async_read_only_engine)]
+DDatabaseAsyncReadOnlyEngine = Annotated[AsyncEngine, Depends(database_async_read_only_engine)]
 
 
+@functools.lru_cache
 def database_async_read_write_session_maker(
     db_async_read_write_engine: DDatabaseAsyncReadWriteEngine,
 ) -> async_sessionmaker[AsyncSession]:
@@ -146,12 +249,13 @@ def database_async_read_write_session_maker(
     )
 
 
-# def database_async_read_only_session_maker(
-#     db_async_read_only_engine: DDatabaseAsyncReadOnlyEngine,
-# ) -> async_sessionmaker[AsyncSession]:
-#     return async_sessionmaker(
-#         autoflush=False, bind=db_async_read_only_engine, expire_on_commit=False
-#     )
+@functools.lru_cache
+def database_async_read_only_session_maker(
+    db_async_read_only_engine: DDatabaseAsyncReadOnlyEngine,
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        autoflush=False, bind=db_async_read_only_engine, expire_on_commit=False
+    )
 
 
 DDatabaseAsyncReadWriteSessionMaker = Annotated[
@@ -159,9 +263,10 @@ DDatabaseAsyncReadWriteSessionMaker = Annotated[
 ]
 
 
-# DDatabaseAsyncReadOnlySessionMaker = Annotated[
-#     async_sessionmaker[AsyncSession], Depends(database_async_read_only_session_maker)
-# ]
+DDatabaseAsyncReadOnlySessionMaker = Annotated[
+    async_sessionmaker[AsyncSession], Depends(database_async_read_only_session_maker)
+]
+
 
 async def temporal_client() -> TemporalClient:
     return GlobalDependencies().temporal_client
@@ -174,4 +279,44 @@ async def docker_client():
     return GlobalDependencies().docker_client
 
 
-DDockerClient = Annotated[DockerClient, Depends(docker_client)]
+DDockerClient = Annotated["DockerClient", Depends(docker_client)]
+
+
+def redis_client() -> redis.Redis:
+    return GlobalDependencies().redis_client
+
+
+DRedisClient = Annotated[redis.Redis, Depends(redis_client)]
+
+
+async def kubernetes_api_client() -> "ApiClient":
+    return await GlobalDependencies().get_kubernetes_api_client()
+
+
+DKubernetesApiClient = Annotated["ApiClient", Depends(kubernetes_api_client)]
+
+
+def http_client() -> httpx.AsyncClient:
+    return GlobalDependencies().http_client
+
+
+DHttpClient = Annotated[httpx.AsyncClient, Depends(http_client)]
+
+
+def singleton(cls: Type[T]) -> Callable[..., T]:
+    """
+    Dependency that builds `cls` from its own dependencies on first use and returns that same instance for the
+    rest of the process, instead of building a new one for every request. Only for classes that hold no
+    per-request state.
+    """
+    instance: Optional[T] = None
+
+    def resolve(**kwargs) -> T:
+        nonlocal instance
+        if instance is None:
+            instance = cls(**kwargs)
+        return instance
+
+    # FastAPI resolves the class' constructor arguments from the signature
+    resolve.__signature__ = inspect.signature(cls)
+    return resolve
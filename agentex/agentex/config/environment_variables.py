@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import json
 import os
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
+from pydantic import Field, field_validator
 
 from agentex.utils.model_utils import BaseModel
 
@@ -16,6 +18,7 @@ class EnvVarKeys(str, Enum):
     ENV = "ENV"
     OPENAI_API_KEY = "OPENAI_API_KEY"
     DATABASE_URL = "DATABASE_URL"
+    READ_ONLY_DATABASE_URL = "READ_ONLY_DATABASE_URL"
     TEMPORAL_ADDRESS = "TEMPORAL_ADDRESS"
     REDIS_URL = "REDIS_URL"
     TEMPORAL_WORKER_ACTIVITY_THREAD_POOL_SIZE = "TEMPORAL_WORKER_ACTIVITY_THREAD_POOL_SIZE"
@@ -25,6 +28,39 @@ class EnvVarKeys(str, Enum):
     BUILD_CONTEXT_PVC_NAME = "BUILD_CONTEXT_PVC_NAME"
     BUILD_REGISTRY_SECRET_NAME = "BUILD_REGISTRY_SECRET_NAME"
     AGENTS_NAMESPACE = "AGENTS_NAMESPACE"
+    TASK_SUBMISSION_CONCURRENCY = "TASK_SUBMISSION_CONCURRENCY"
+    WORKFLOW_DESCRIBE_CONCURRENCY = "WORKFLOW_DESCRIBE_CONCURRENCY"
+    TASK_EVENTS_MAX_LENGTH = "TASK_EVENTS_MAX_LENGTH"
+    TASK_EVENTS_TTL_SECONDS = "TASK_EVENTS_TTL_SECONDS"
+    TASK_EVENTS_HEARTBEAT_SECONDS = "TASK_EVENTS_HEARTBEAT_SECONDS"
+    TASK_EVENTS_MESSAGE_POLL_SECONDS = "TASK_EVENTS_MESSAGE_POLL_SECONDS"
+    AGENT_PACKAGE_MAX_SIZE_BYTES = "AGENT_PACKAGE_MAX_SIZE_BYTES"
+    IDEMPOTENCY_KEY_TTL_SECONDS = "IDEMPOTENCY_KEY_TTL_SECONDS"
+    IDEMPOTENCY_LOCK_TTL_SECONDS = "IDEMPOTENCY_LOCK_TTL_SECONDS"
+    IDEMPOTENCY_WAIT_SECONDS = "IDEMPOTENCY_WAIT_SECONDS"
+    TASK_RATE_LIMITS = "TASK_RATE_LIMITS"
+    AGENT_RUNNING_TASK_LIMITS = "AGENT_RUNNING_TASK_LIMITS"
+    TASK_ADMISSION_WAIT_SECONDS = "TASK_ADMISSION_WAIT_SECONDS"
+    TASK_LEASE_SECONDS = "TASK_LEASE_SECONDS"
+    TRACING_EXPORTER = "TRACING_EXPORTER"
+    TRACING_FILE_PATH = "TRACING_FILE_PATH"
+    TRACING_SAMPLE_RATIO = "TRACING_SAMPLE_RATIO"
+    DATABASE_POOL_SIZE = "DATABASE_POOL_SIZE"
+    REDIS_MAX_CONNECTIONS = "REDIS_MAX_CONNECTIONS"
+    HTTP_MAX_CONNECTIONS = "HTTP_MAX_CONNECTIONS"
+    KUBERNETES_MAX_CONNECTIONS = "KUBERNETES_MAX_CONNECTIONS"
+    DATABASE_WARM_CONNECTIONS = "DATABASE_WARM_CONNECTIONS"
+    REDIS_WARM_CONNECTIONS = "REDIS_WARM_CONNECTIONS"
+    READINESS_MAX_DB_CHECKOUT_WAIT_SECONDS = "READINESS_MAX_DB_CHECKOUT_WAIT_SECONDS"
+    READINESS_MAX_EVENT_LOOP_LAG_SECONDS = "READINESS_MAX_EVENT_LOOP_LAG_SECONDS"
+    READINESS_MAX_IN_FLIGHT_REQUESTS = "READINESS_MAX_IN_FLIGHT_REQUESTS"
+    LOAD_SHEDDING_ENABLED = "LOAD_SHEDDING_ENABLED"
+    EVENT_LOOP_LAG_SAMPLE_INTERVAL_SECONDS = "EVENT_LOOP_LAG_SAMPLE_INTERVAL_SECONDS"
+    BLOCKING_CALL_DETECTION_ENABLED = "BLOCKING_CALL_DETECTION_ENABLED"
+    BLOCKING_CALL_THRESHOLD_SECONDS = "BLOCKING_CALL_THRESHOLD_SECONDS"
+    READ_ONLY_DATABASE_POOL_SIZE = "READ_ONLY_DATABASE_POOL_SIZE"
+    READ_YOUR_WRITES_SECONDS = "READ_YOUR_WRITES_SECONDS"
+    BULK_CREATE_MIN_ITEMS = "BULK_CREATE_MIN_ITEMS"
 
 
 class Environment(str, Enum):
@@ -32,13 +68,25 @@ class Environment(str, Enum):
     PROD = "production"
 
 
+class RateLimit(BaseModel):
+    # A bucket that never refills would make clients wait forever, so both have to be positive
+    per_second: float = Field(..., gt=0)
+    burst: int = Field(..., ge=1)
+
+
 refreshed_environment_variables = None
 
 
+def _defined_environment_variables(*keys: EnvVarKeys) -> Dict[str, str]:
+    """Only pass through variables that are set, so the field defaults below apply to the rest."""
+    return {key.value: os.environ[key] for key in keys if key in os.environ}
+
+
 class EnvironmentVariables(BaseModel):
     ENV: Optional[str] = Environment.DEV
     OPENAI_API_KEY: Optional[str]
     DATABASE_URL: Optional[str]
+    READ_ONLY_DATABASE_URL: Optional[str] = None  # A read replica for repository reads. Reads use the primary if unset
     TEMPORAL_ADDRESS: Optional[str]
     REDIS_URL: Optional[str]
     TEMPORAL_WORKER_ACTIVITY_THREAD_POOL_SIZE: int = 4  # Default 4 for local dev
@@ -48,6 +96,52 @@ class EnvironmentVariables(BaseModel):
     BUILD_CONTEXT_PVC_NAME: Optional[str] = None
     BUILD_REGISTRY_SECRET_NAME: Optional[str] = None
     AGENTS_NAMESPACE: Optional[str] = None
+    TASK_SUBMISSION_CONCURRENCY: int = 16  # Max concurrent workflow starts per batch submission
+    WORKFLOW_DESCRIBE_CONCURRENCY: int = 32  # Max concurrent workflow describe calls per batch lookup
+    TASK_EVENTS_MAX_LENGTH: int = 10000  # Approximate number of events kept per task for resuming streams
+    TASK_EVENTS_TTL_SECONDS: int = 86400  # Task event streams expire this long after their last event
+    TASK_EVENTS_HEARTBEAT_SECONDS: float = 15  # Idle interval after which event streams send a keep-alive
+    TASK_EVENTS_MESSAGE_POLL_SECONDS: float = 1  # How often event streams check the agent state for new messages
+    AGENT_PACKAGE_MAX_SIZE_BYTES: int = 512 * 1024 * 1024  # Largest agent package accepted for upload
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 86400  # How long responses are kept for replay by idempotency key
+    IDEMPOTENCY_LOCK_TTL_SECONDS: int = 300  # How long an in-flight request holds its idempotency key
+    IDEMPOTENCY_WAIT_SECONDS: float = 30  # How long a duplicate request waits for the in-flight one to finish
+    # Task creation rate limits as JSON, keyed by "client:<API key>" or "agent:<agent name>", with "client:*" and
+    # "agent:*" as the defaults for everyone else. No limits if unset.
+    TASK_RATE_LIMITS: Dict[str, RateLimit] = {}
+    # Max concurrently running tasks as JSON, keyed by agent name with "*" as the default. No limits if unset.
+    AGENT_RUNNING_TASK_LIMITS: Dict[str, int] = {}
+    TASK_ADMISSION_WAIT_SECONDS: float = 10  # How long task creation waits for a free running task slot
+    TASK_LEASE_SECONDS: int = 86400  # Running task slots are reclaimed after this long, matching the workflow timeout
+    TRACING_EXPORTER: Optional[str] = None  # "otlp", "console" or "file". Tracing is disabled if unset
+    TRACING_FILE_PATH: str = "traces.jsonl"  # Where the "file" exporter appends spans, one JSON object per line
+    TRACING_SAMPLE_RATIO: float = 1.0  # Fraction of traces started by this service that are recorded
+    DATABASE_POOL_SIZE: int = 10  # Database connections kept open per process
+    REDIS_MAX_CONNECTIONS: int = 100  # Max Redis connections per process, shared by all requests
+    HTTP_MAX_CONNECTIONS: int = 100  # Max outbound HTTP connections per process, e.g. to agent servers
+    KUBERNETES_MAX_CONNECTIONS: int = 32  # Max connections to the Kubernetes API per process
+    DATABASE_WARM_CONNECTIONS: int = 5  # Database connections opened at startup, before reporting ready
+    REDIS_WARM_CONNECTIONS: int = 5  # Redis connections opened at startup, before reporting ready
+    # Saturation thresholds over which /readyz reports not ready, judged on the worst sample of the last 10s.
+    # A threshold that is unset is not checked.
+    READINESS_MAX_DB_CHECKOUT_WAIT_SECONDS: Optional[float] = 1.0
+    READINESS_MAX_EVENT_LOOP_LAG_SECONDS: Optional[float] = 0.5
+    # Includes open event streams and result long-polls, so size it for those if set
+    READINESS_MAX_IN_FLIGHT_REQUESTS: Optional[int] = None
+    LOAD_SHEDDING_ENABLED: bool = False  # Reject requests with 503 while over a saturation threshold
+    EVENT_LOOP_LAG_SAMPLE_INTERVAL_SECONDS: float = 0.5  # How often event loop lag is measured
+    BLOCKING_CALL_DETECTION_ENABLED: bool = False  # Log the stack of callbacks that block the event loop
+    BLOCKING_CALL_THRESHOLD_SECONDS: float = 0.1  # How long a callback may hold the event loop before it is logged
+    READ_ONLY_DATABASE_POOL_SIZE: int = 10  # Pooled connections to the read replica per process
+    # If set, reads go to the primary for this long after a write in the same request, so they see the write
+    # despite replication lag
+    READ_YOUR_WRITES_SECONDS: Optional[float] = None
+    BULK_CREATE_MIN_ITEMS: int = 10  # Batches of at least this many items are created with COPY
+
+    @field_validator("TASK_RATE_LIMITS", "AGENT_RUNNING_TASK_LIMITS", mode="before")
+    @classmethod
+    def _parse_json(cls, value):
+        return json.loads(value) if isinstance(value, str) else value
 
     @classmethod
     def refresh(cls) -> Optional[EnvironmentVariables]:
@@ -61,6 +155,7 @@ class EnvironmentVariables(BaseModel):
             ENV=os.environ.get(EnvVarKeys.ENV),
             OPENAI_API_KEY=os.environ.get(EnvVarKeys.OPENAI_API_KEY),
             DATABASE_URL=os.environ.get(EnvVarKeys.DATABASE_URL),
+            READ_ONLY_DATABASE_URL=os.environ.get(EnvVarKeys.READ_ONLY_DATABASE_URL),
             TEMPORAL_ADDRESS=os.environ.get(EnvVarKeys.TEMPORAL_ADDRESS),
             REDIS_URL=os.environ.get(EnvVarKeys.REDIS_URL),
             BUILD_REGISTRY_URL=os.environ.get(EnvVarKeys.BUILD_REGISTRY_URL),
@@ -68,6 +163,41 @@ class EnvironmentVariables(BaseModel):
             BUILD_CONTEXT_PVC_NAME=os.environ.get(EnvVarKeys.BUILD_CONTEXT_PVC_NAME),
             BUILD_REGISTRY_SECRET_NAME=os.environ.get(EnvVarKeys.BUILD_REGISTRY_SECRET_NAME),
             AGENTS_NAMESPACE=os.environ.get(EnvVarKeys.AGENTS_NAMESPACE),
+            **_defined_environment_variables(
+                EnvVarKeys.TASK_SUBMISSION_CONCURRENCY,
+                EnvVarKeys.WORKFLOW_DESCRIBE_CONCURRENCY,
+                EnvVarKeys.TASK_EVENTS_MAX_LENGTH,
+                EnvVarKeys.TASK_EVENTS_TTL_SECONDS,
+                EnvVarKeys.TASK_EVENTS_HEARTBEAT_SECONDS,
+                EnvVarKeys.TASK_EVENTS_MESSAGE_POLL_SECONDS,
+                EnvVarKeys.AGENT_PACKAGE_MAX_SIZE_BYTES,
+                EnvVarKeys.IDEMPOTENCY_KEY_TTL_SECONDS,
+                EnvVarKeys.IDEMPOTENCY_LOCK_TTL_SECONDS,
+                EnvVarKeys.IDEMPOTENCY_WAIT_SECONDS,
+                EnvVarKeys.TASK_RATE_LIMITS,
+                EnvVarKeys.AGENT_RUNNING_TASK_LIMITS,
+                EnvVarKeys.TASK_ADMISSION_WAIT_SECONDS,
+                EnvVarKeys.TASK_LEASE_SECONDS,
+                EnvVarKeys.TRACING_EXPORTER,
+                EnvVarKeys.TRACING_FILE_PATH,
+                EnvVarKeys.TRACING_SAMPLE_RATIO,
+                EnvVarKeys.DATABASE_POOL_SIZE,
+                EnvVarKeys.REDIS_MAX_CONNECTIONS,
+                EnvVarKeys.HTTP_MAX_CONNECTIONS,
+                EnvVarKeys.KUBERNETES_MAX_CONNECTIONS,
+                EnvVarKeys.DATABASE_WARM_CONNECTIONS,
+                EnvVarKeys.REDIS_WARM_CONNECTIONS,
+                EnvVarKeys.READINESS_MAX_DB_CHECKOUT_WAIT_SECONDS,
+                EnvVarKeys.READINESS_MAX_EVENT_LOOP_LAG_SECONDS,
+                EnvVarKeys.READINESS_MAX_IN_FLIGHT_REQUESTS,
+                EnvVarKeys.LOAD_SHEDDING_ENABLED,
+                EnvVarKeys.EVENT_LOOP_LAG_SAMPLE_INTERVAL_SECONDS,
+                EnvVarKeys.BLOCKING_CALL_DETECTION_ENABLED,
+                EnvVarKeys.BLOCKING_CALL_THRESHOLD_SECONDS,
+                EnvVarKeys.READ_ONLY_DATABASE_POOL_SIZE,
+                EnvVarKeys.READ_YOUR_WRITES_SECONDS,
+                EnvVarKeys.BULK_CREATE_MIN_ITEMS,
+            ),
         )
         refreshed_environment_variables = environment_variables
         return refreshed_environment_variables
@@ -1,7 +1,5 @@
 from typing import List, Optional, Union, Type
 
-from litellm.types.completion import CompletionRequest
-
 from agentex.domain.entities.agents import Agent
 from agentex.utils.model_utils import BaseModel
 
@@ -48,6 +48,11 @@ class Agent(BaseModel):
         None,
         description="The reason for the status of the action."
     )
+    package_digest: Optional[str] = Field(
+        None,
+        description="The SHA-256 digest of the agent package that `docker_image` was built from. Only set once "
+                    "the build has succeeded."
+    )
     build_job_name: Optional[str] = Field(
         None,
         description="The name of the build job that is building the action."
@@ -0,0 +1,18 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import Field
+
+from agentex.utils.model_utils import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T] = Field(
+        default_factory=list,
+        description="The items on this page, ordered by creation time.",
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor to pass back to fetch the next page. Null if this is the last page.",
+    )
@@ -0,0 +1,50 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import Field
+
+from agentex.adapters.async_runtime.adapter_temporal import TaskStatus
+from agentex.domain.entities.messages import Message
+from agentex.utils.model_utils import BaseModel
+
+
+class TaskEventType(str, Enum):
+    STATUS = "status"
+    MESSAGE = "message"
+
+
+class TaskEvent(BaseModel):
+    id: Optional[str] = Field(
+        None,
+        description="The ID of the event, assigned when it is published. Pass it back as `Last-Event-ID` to "
+                    "resume a stream after this event. Not set for snapshots of the current task status or for "
+                    "`message` events.",
+    )
+    type: TaskEventType = Field(
+        ...,
+        description="Whether the task status changed or a message was appended to one of its threads.",
+    )
+    status: Optional[TaskStatus] = Field(
+        None,
+        description="The new status of the task. Only set on `status` events.",
+    )
+    status_reason: Optional[str] = Field(
+        None,
+        description="The reason for the new status. Only set on `status` events.",
+    )
+    is_terminal: bool = Field(
+        False,
+        description="Whether the task will not change status again. Only set on `status` events.",
+    )
+    thread_name: Optional[str] = Field(
+        None,
+        description="The thread the message was appended to. Only set on `message` events.",
+    )
+    message_index: Optional[int] = Field(
+        None,
+        description="The position of the message in its thread. Only set on `message` events.",
+    )
+    message: Optional[Message] = Field(
+        None,
+        description="The appended message. Only set on `message` events.",
+    )
@@ -1,9 +1,12 @@
-from typing import Optional
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional, Set
 
-from pydantic import Field
+from pydantic import Field, field_serializer
 
 from agentex.adapters.async_runtime.adapter_temporal import TaskStatus
 from agentex.domain.entities.agents import Agent
+from agentex.domain.exceptions import ClientError
 from agentex.utils.model_utils import BaseModel
 
 
@@ -30,7 +33,92 @@ class Task(BaseModel):
     )
 
 
+class StoredTask(Task):
+    """A task along with when its row was created and last updated, which the database sets."""
+    created_at: Optional[datetime] = Field(
+        None,
+        title="When the task was created",
+    )
+    updated_at: Optional[datetime] = Field(
+        None,
+        title="When the task's row was last updated",
+    )
+
+
 class AgentTaskWorkflowParams(BaseModel):
     task: Task
     agent: Agent
     require_approval: Optional[bool] = False
+
+
+class TaskField(str, Enum):
+    STATUS = "status"
+    THREADS = "threads"
+    CONTEXT = "context"
+
+
+class TaskFields(BaseModel):
+    """
+    The optional parts of a task to load on read. The task's own row is always returned, but its live status
+    comes from the async runtime and its threads and context come from the agent state, and each of those is
+    only fetched when asked for.
+    """
+    status: bool = Field(
+        False,
+        description="Whether to fetch the live task status from the async runtime.",
+    )
+    context: bool = Field(
+        False,
+        description="Whether to include the agent state's context.",
+    )
+    threads: bool = Field(
+        False,
+        description="Whether to include the agent state's message threads.",
+    )
+    thread_names: Optional[Set[str]] = Field(
+        None,
+        description="If set, only these threads are included. If not set, all threads are included.",
+    )
+
+    @field_serializer("thread_names")
+    def _serialize_thread_names(self, thread_names: Optional[Set[str]]) -> Optional[List[str]]:
+        # Sorted so that equal selections always serialize the same way
+        return sorted(thread_names) if thread_names is not None else None
+
+    @property
+    def agent_state(self) -> bool:
+        return self.context or self.threads
+
+    @classmethod
+    def all(cls) -> "TaskFields":
+        return cls(status=True, context=True, threads=True)
+
+    @classmethod
+    def parse(cls, fields: List[str]) -> "TaskFields":
+        """
+        Parse field names such as `status`, `threads`, `context` or `threads.<name>`. Each entry may also be a
+        comma-separated list of field names.
+        """
+        parsed = cls()
+        all_threads = False
+        for field in (name.strip() for entry in fields for name in entry.split(",")):
+            if not field:
+                continue
+            if field == TaskField.STATUS:
+                parsed.status = True
+            elif field == TaskField.CONTEXT:
+                parsed.context = True
+            elif field == TaskField.THREADS:
+                parsed.threads = True
+                all_threads = True
+            elif field.startswith(f"{TaskField.THREADS.value}.") and len(field) > len(TaskField.THREADS.value) + 1:
+                parsed.threads = True
+                parsed.thread_names = (parsed.thread_names or set()) | {field[len(TaskField.THREADS.value) + 1:]}
+            else:
+                raise ClientError(
+                    f"Unknown task field '{field}'. "
+                    f"Expected one of {[field.value for field in TaskField]} or 'threads.<name>'."
+                )
+        if all_threads:
+            parsed.thread_names = None
+        return parsed
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 
 class GenericException(Exception):
@@ -6,15 +6,22 @@ class GenericException(Exception):
     message: str
     code: int = 500  # Default code is 500
     detail: str = None
+    headers: Optional[Dict[str, str]] = None  # Extra response headers, e.g. Retry-After
 
     def __init__(
-        self, message: str, code: int = None, detail: Optional[Union[str, List[str]]] = None
+        self,
+        message: str,
+        code: int = None,
+        detail: Optional[Union[str, List[str]]] = None,
+        headers: Optional[Dict[str, str]] = None,
     ):
         self.message = message
         if code is not None:
             self.code = code
         if detail is not None:
             self.detail = detail
+        if headers is not None:
+            self.headers = headers
 
     def __str__(self):
         return self.message
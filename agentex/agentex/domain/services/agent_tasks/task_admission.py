@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Annotated, Dict, List, Optional
+
+from fastapi import Depends
+
+from agentex.adapters.kv_store.adapter_redis import DRedisRepository
+from agentex.config.dependencies import DEnvironmentVariables
+from agentex.config.environment_variables import RateLimit
+from agentex.domain.entities.agents import Agent
+from agentex.domain.entities.tasks import Task
+from agentex.domain.exceptions import ClientError
+from agentex.domain.services.agent_tasks.task_service import DAgentTaskService
+from agentex.utils.logging import make_logger
+
+logger = make_logger(__name__)
+
+ADMISSION_POLL_INTERVAL_SECONDS = 0.25
+RECONCILE_INTERVAL_SECONDS = 5
+
+# When each agent's running task slots were last reconciled against the async runtime by this process
+_last_reconciled_at: Dict[str, float] = {}
+
+
+class RateLimitExceededError(ClientError):
+    """
+    Exception raised when a client or agent is over its task creation rate or running task limit.
+    """
+
+    code = 429
+
+
+class TaskAdmission:
+    """
+    Decides whether new tasks may be created, so that one noisy client or agent cannot saturate the database,
+    the async runtime or the agent deployments for everyone else.
+
+    Creation rates are limited with token buckets per client and per agent. Running tasks are limited per agent
+    with leases that are taken when a task is created and released when it is seen to finish.
+    """
+
+    def __init__(
+        self,
+        memory_repo: DRedisRepository,
+        task_service: DAgentTaskService,
+        environment_variables: DEnvironmentVariables,
+    ):
+        self.memory_repo = memory_repo
+        self.task_service = task_service
+        self.rate_limits = environment_variables.TASK_RATE_LIMITS
+        self.running_task_limits = environment_variables.AGENT_RUNNING_TASK_LIMITS
+        self.wait_seconds = environment_variables.TASK_ADMISSION_WAIT_SECONDS
+        self.lease_seconds = environment_variables.TASK_LEASE_SECONDS
+
+    async def check_rate_limits(self, client_id: Optional[str], agent_names: List[str]) -> None:
+        """
+        Take one token per task from the client's bucket and from each agent's bucket. Raises
+        RateLimitExceededError, with the time to wait in its Retry-After header, if any of them is empty.
+        """
+        buckets = []
+        client_limit = self._rate_limit("client", client_id) if client_id else None
+        if client_limit is not None:
+            client_key = hashlib.sha256(client_id.encode()).hexdigest()[:32]
+            buckets.append((f"rate_limit:client:{client_key}", client_limit, len(agent_names)))
+        for agent_name, count in Counter(agent_names).items():
+            agent_limit = self._rate_limit("agent", agent_name)
+            if agent_limit is not None:
+                buckets.append((f"rate_limit:agent:{agent_name}", agent_limit, count))
+
+        for key, limit, count in buckets:
+            if count > limit.burst:
+                raise RateLimitExceededError(
+                    f"Creating {count} tasks at once exceeds the burst limit of {limit.burst}."
+                )
+
+        waits = await asyncio.gather(*(
+            self.memory_repo.take_tokens(
+                key=key,
+                rate_per_second=limit.per_second,
+                capacity=limit.burst,
+                tokens=count,
+            )
+            for key, limit, count in buckets
+        ))
+        wait = max(waits, default=0)
+        if wait > 0:
+            raise RateLimitExceededError(
+                "Too many tasks created. Retry after the time given in the Retry-After header.",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+    async def acquire_running_slot(self, agent: Agent, task_id: str, wait: bool = True) -> None:
+        """
+        Take one of the agent's running task slots for the task, waiting for one to free up if they are all
+        taken and `wait` is set. Raises RateLimitExceededError if none frees up in time.
+        """
+        limit = self.running_task_limits.get(agent.name, self.running_task_limits.get("*"))
+        if limit is None:
+            return
+
+        key = self._running_tasks_key(agent.id)
+        deadline = time.monotonic() + (self.wait_seconds if wait else 0)
+        while not await self.memory_repo.acquire_lease(
+            key=key,
+            holder=task_id,
+            limit=limit,
+            lease_seconds=self.lease_seconds,
+        ):
+            if await self._release_finished(key):
+                continue
+            if time.monotonic() >= deadline:
+                raise RateLimitExceededError(
+                    f"Agent '{agent.name}' is already running its maximum of {limit} tasks. Retry later.",
+                    headers={"Retry-After": str(math.ceil(ADMISSION_POLL_INTERVAL_SECONDS))},
+                )
+            await asyncio.sleep(ADMISSION_POLL_INTERVAL_SECONDS)
+
+    async def release_running_slots(self, tasks: List[Task]) -> None:
+        """Give back the running task slots of tasks that have finished or failed to start."""
+        if not self.running_task_limits:
+            return
+        task_ids_by_agent = defaultdict(list)
+        for task in tasks:
+            task_ids_by_agent[task.agent_id].append(task.id)
+        await asyncio.gather(*(
+            self.memory_repo.release_leases(key=self._running_tasks_key(agent_id), holders=task_ids)
+            for agent_id, task_ids in task_ids_by_agent.items()
+        ))
+
+    async def _release_finished(self, key: str) -> bool:
+        """
+        Slots are normally released when a read notices that a task finished, which may never happen. When an
+        agent is out of slots, check its running tasks against the async runtime, at most every few seconds,
+        and release those that finished. Returns whether any were released.
+        """
+        now = time.monotonic()
+        if now - _last_reconciled_at.get(key, 0) < RECONCILE_INTERVAL_SECONDS:
+            return False
+        _last_reconciled_at[key] = now
+
+        task_ids = await self.memory_repo.get_lease_holders(key=key)
+        states = await self.task_service.batch_get_state(task_ids=task_ids)
+        finished = [task_id for task_id, state in states.items() if state.is_terminal]
+        if finished:
+            logger.info(f"Releasing running task slots of finished tasks: {finished}")
+            await self.memory_repo.release_leases(key=key, holders=finished)
+        return bool(finished)
+
+    def _rate_limit(self, kind: str, name: str) -> Optional[RateLimit]:
+        return self.rate_limits.get(f"{kind}:{name}", self.rate_limits.get(f"{kind}:*"))
+
+    @staticmethod
+    def _running_tasks_key(agent_id: str) -> str:
+        return f"running_tasks:{agent_id}"
+
+
+DTaskAdmission = Annotated[TaskAdmission, Depends(TaskAdmission)]
@@ -1,12 +1,18 @@
-from typing import Annotated, Optional
+import asyncio
+from typing import Annotated, Dict, List, Optional
 
 from fastapi import Depends
 
 from agentex.adapters.async_runtime.adapter_temporal import DTemporalGateway
+from agentex.config.dependencies import DEnvironmentVariables
 from agentex.domain.entities.agents import Agent
 from agentex.domain.entities.tasks import Task, AgentTaskWorkflowParams
 from agentex.domain.entities.workflows import WorkflowState
 from agentex.domain.workflows.entities.messages import SignalName, HumanInstruction
+from agentex.utils.shared_waits import SharedWaits
+
+# Shared across requests so that every caller waiting on the same task in this process shares one wait
+_completion_waits: SharedWaits[WorkflowState] = SharedWaits()
 
 
 class AgentTaskService:
@@ -17,8 +23,10 @@ class AgentTaskService:
     def __init__(
         self,
         async_runtime: DTemporalGateway,
+        environment_variables: DEnvironmentVariables,
     ):
         self.async_runtime = async_runtime
+        self.describe_concurrency = environment_variables.WORKFLOW_DESCRIBE_CONCURRENCY
 
     async def submit_task(self, task: Task, agent: Agent, require_approval: Optional[bool] = False) -> str:
         """
@@ -45,6 +53,30 @@ class AgentTaskService:
             workflow_id=task_id,
         )
 
+    async def batch_get_state(self, task_ids: List[str]) -> Dict[str, WorkflowState]:
+        """
+        Get the state of many tasks from the async runtime, with a bounded number of requests in flight.
+        """
+        semaphore = asyncio.Semaphore(self.describe_concurrency)
+
+        async def get_state(task_id: str) -> WorkflowState:
+            async with semaphore:
+                return await self.get_state(task_id=task_id)
+
+        states = await asyncio.gather(*(get_state(task_id) for task_id in task_ids))
+        return dict(zip(task_ids, states))
+
+    async def wait_for_completion(self, task_id: str, timeout_seconds: Optional[float]) -> Optional[WorkflowState]:
+        """
+        Wait up to `timeout_seconds`, or until it finishes if it is None, for the task to finish. Returns its
+        final state, or None if it is still running at the timeout.
+        """
+        return await _completion_waits.wait(
+            key=task_id,
+            start=lambda: self.async_runtime.wait_for_workflow(workflow_id=task_id),
+            timeout_seconds=timeout_seconds,
+        )
+
     async def instruct(self, task_id: str, prompt: str) -> None:
         return await self.async_runtime.send_signal(
             workflow_id=task_id,
@@ -6,7 +6,12 @@ from sqlalchemy import select
 from agentex.adapters.crud_store.adapter_postgres import PostgresCRUDRepository, async_sql_exception_handler
 from agentex.adapters.crud_store.exceptions import ItemDoesNotExist
 from agentex.adapters.orm import AgentORM
-from agentex.config.dependencies import DDatabaseAsyncReadWriteSessionMaker
+from agentex.config.dependencies import (
+    DDatabaseAsyncReadOnlySessionMaker,
+    DDatabaseAsyncReadWriteSessionMaker,
+    DEnvironmentVariables,
+    singleton,
+)
 from agentex.domain.entities.agents import Agent
 from agentex.utils.logging import make_logger
 
@@ -17,8 +22,16 @@ class AgentRepository(PostgresCRUDRepository[AgentORM, Agent]):
     def __init__(
         self,
         async_read_write_session_maker: DDatabaseAsyncReadWriteSessionMaker,
+        async_read_only_session_maker: DDatabaseAsyncReadOnlySessionMaker,
+        environment_variables: DEnvironmentVariables,
     ):
-        super().__init__(async_read_write_session_maker, AgentORM, Agent)
+        super().__init__(
+            async_read_write_session_maker=async_read_write_session_maker,
+            async_read_only_session_maker=async_read_only_session_maker,
+            orm=AgentORM,
+            entity=Agent,
+            environment_variables=environment_variables,
+        )
 
 
-DAgentRepository = Annotated[AgentRepository, Depends(AgentRepository)]
+DAgentRepository = Annotated[AgentRepository, Depends(singleton(AgentRepository))]
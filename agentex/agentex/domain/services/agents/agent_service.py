@@ -1,4 +1,4 @@
-from typing import Annotated, Optional, Tuple, Union
+from typing import Annotated, Any, Optional, Tuple, Union
 
 from fastapi import Depends
 from kubernetes_asyncio import client as k8s_client
@@ -267,5 +267,8 @@ class AgentService:
     async def update_agent(self, agent: Agent) -> Agent:
         return await self.agent_repo.update(item=agent)
 
+    async def patch_agent(self, id: str, **fields: Any) -> Agent:
+        return await self.agent_repo.patch(id=id, **fields)
+
 
 DAgentService = Annotated[AgentService, Depends(AgentService)]
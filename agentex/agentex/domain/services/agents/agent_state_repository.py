@@ -1,4 +1,4 @@
-from typing import Optional, Annotated
+from typing import Optional, Annotated, Dict, List
 
 from fastapi import Depends
 
@@ -16,7 +16,7 @@ class AgentStateRepository:
         return state.to_json()
 
     @staticmethod
-    def _deserialize(data: Optional[str]) -> AgentState:
+    def deserialize(data: Optional[str]) -> AgentState:
         """Deserialize the JSON string back into an AgentState object."""
         if data is None:
             return AgentState()
@@ -27,10 +27,23 @@ class AgentStateRepository:
         serialized_state = self._serialize(state)
         await self.memory_repo.set(task_id, serialized_state)
 
+    async def load_serialized(self, task_id: str) -> Optional[str]:
+        """
+        Load the AgentState from Redis exactly as it is stored. Agents write their state to Redis directly, so
+        hashing what is stored is the only reliable way to tell whether it changed.
+        """
+        data = await self.memory_repo.get(task_id)
+        return data.decode() if isinstance(data, bytes) else data
+
     async def load(self, task_id: str) -> AgentState:
         """Load the AgentState from Redis."""
         data = await self.memory_repo.get(task_id)
-        return self._deserialize(data)
+        return self.deserialize(data)
+
+    async def batch_load(self, task_ids: List[str]) -> Dict[str, AgentState]:
+        """Load the AgentStates of many tasks from Redis in a single round trip."""
+        data = await self.memory_repo.batch_get(task_ids)
+        return {task_id: self.deserialize(item) for task_id, item in zip(task_ids, data)}
 
     async def delete(self, task_id: str) -> None:
         """Delete the AgentState from Redis."""
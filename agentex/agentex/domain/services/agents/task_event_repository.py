@@ -0,0 +1,56 @@
+from typing import Annotated, List, Optional
+
+from fastapi import Depends
+
+from agentex.adapters.kv_store.adapter_redis import DRedisRepository
+from agentex.config.dependencies import DEnvironmentVariables
+from agentex.domain.entities.task_events import TaskEvent
+
+
+class TaskEventRepository:
+    """
+    Per-task event log kept in a Redis stream. Every API replica reads the same stream, and events can be
+    replayed from any event ID, so subscribers can resume where they left off.
+    """
+
+    def __init__(self, memory_repo: DRedisRepository, environment_variables: DEnvironmentVariables):
+        self.memory_repo = memory_repo
+        self.max_length = environment_variables.TASK_EVENTS_MAX_LENGTH
+        self.ttl_seconds = environment_variables.TASK_EVENTS_TTL_SECONDS
+
+    @staticmethod
+    def _key(task_id: str) -> str:
+        return f"task_events:{task_id}"
+
+    async def publish(self, task_id: str, event: TaskEvent) -> TaskEvent:
+        """Append an event to the task's stream. Returns the event with its assigned ID."""
+        event_id = await self.memory_repo.append_to_stream(
+            key=self._key(task_id),
+            message=event.to_json(exclude={"id"}),
+            max_length=self.max_length,
+            ttl_seconds=self.ttl_seconds,
+        )
+        return event.model_copy(update={"id": event_id})
+
+    async def read(
+        self,
+        task_id: str,
+        after_id: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+    ) -> List[TaskEvent]:
+        """
+        Read the task's events published after `after_id`, or all of them if it is not set. Waits up to
+        `timeout_seconds` for an event if there are none yet.
+        """
+        entries = await self.memory_repo.read_stream(
+            key=self._key(task_id),
+            after_id=after_id,
+            timeout_seconds=timeout_seconds,
+        )
+        return [
+            TaskEvent.from_json(message).model_copy(update={"id": event_id})
+            for event_id, message in entries
+        ]
+
+
+DTaskEventRepository = Annotated[TaskEventRepository, Depends(TaskEventRepository)]
@@ -4,7 +4,12 @@ from fastapi import Depends
 
 from agentex.adapters.crud_store.adapter_postgres import PostgresCRUDRepository
 from agentex.adapters.orm import TaskORM
-from agentex.config.dependencies import DDatabaseAsyncReadWriteSessionMaker
+from agentex.config.dependencies import (
+    DDatabaseAsyncReadOnlySessionMaker,
+    DDatabaseAsyncReadWriteSessionMaker,
+    DEnvironmentVariables,
+    singleton,
+)
 from agentex.domain.entities.tasks import Task
 from agentex.utils.logging import make_logger
 
@@ -12,8 +17,19 @@ logger = make_logger(__name__)
 
 
 class TaskRepository(PostgresCRUDRepository[TaskORM, Task]):
-    def __init__(self, async_read_write_session_maker: DDatabaseAsyncReadWriteSessionMaker):
-        super().__init__(async_read_write_session_maker, TaskORM, Task)
+    def __init__(
+        self,
+        async_read_write_session_maker: DDatabaseAsyncReadWriteSessionMaker,
+        async_read_only_session_maker: DDatabaseAsyncReadOnlySessionMaker,
+        environment_variables: DEnvironmentVariables,
+    ):
+        super().__init__(
+            async_read_write_session_maker=async_read_write_session_maker,
+            async_read_only_session_maker=async_read_only_session_maker,
+            orm=TaskORM,
+            entity=Task,
+            environment_variables=environment_variables,
+        )
 
 
-DTaskRepository = Annotated[TaskRepository, Depends(TaskRepository)]
+DTaskRepository = Annotated[TaskRepository, Depends(singleton(TaskRepository))]
@@ -1,5 +1,7 @@
+import asyncio
 import shutil
 import tempfile
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Annotated
 
@@ -7,15 +9,17 @@ from fastapi import Depends, UploadFile
 
 from agentex.adapters.async_runtime.adapter_temporal import DTemporalGateway
 from agentex.adapters.async_runtime.port import DuplicateWorkflowPolicy
-from agentex.adapters.crud_store.exceptions import ItemDoesNotExist
 from agentex.config.dependencies import DEnvironmentVariables
 from agentex.domain.entities.agents import Agent, AgentStatus
+from agentex.domain.entities.pagination import Page
 from agentex.domain.services.agents.agent_repository import DAgentRepository
 from agentex.domain.workflows.constants import BUILD_AGENT_TASK_QUEUE
+from agentex.domain.workflows.activities.build_agent import package_image_tag
 from agentex.domain.workflows.create_agent_workflow import BuildAgentWorkflow, BuildAgentWorkflowParams
 from agentex.utils.ids import orm_id
 from agentex.utils.logging import make_logger
 from agentex.utils.timestamp import timestamp
+from agentex.utils.uploads import UploadTooLargeError, save_upload
 
 logger = make_logger(__name__)
 
@@ -31,6 +35,7 @@ class AgentsUseCase:
         self.agent_repo = agent_repository
         self.async_runtime = async_runtime
         self.build_contexts_path = environment_variables.BUILD_CONTEXTS_PATH
+        self.package_max_size_bytes = environment_variables.AGENT_PACKAGE_MAX_SIZE_BYTES
         self.task_queue = BUILD_AGENT_TASK_QUEUE
 
     async def create(
@@ -42,42 +47,69 @@ class AgentsUseCase:
         workflow_queue_name: str,
         update_if_exists: bool = True,
     ) -> Agent:
+        # The multipart parser already knows the size, so reject oversized packages before copying anything
+        if agent_package.size is not None and agent_package.size > self.package_max_size_bytes:
+            raise UploadTooLargeError(
+                f"Agent package is {agent_package.size} bytes, "
+                f"larger than the maximum of {self.package_max_size_bytes} bytes."
+            )
 
         # Create a temporary directory in the self.build_contexts_path directory
         # You must put the temporary directory in the build_contexts_path directory, otherwise
         # the builder job will not be able to access the files
         with tempfile.TemporaryDirectory(dir=self.build_contexts_path, delete=False) as temp_dir:
-            # Save the uploaded zip file locally
-            file_location = Path(temp_dir) / agent_package.filename
-
-            with open(file_location, "wb") as buffer:
-                shutil.copyfileobj(agent_package.file, buffer)
-
+            # Save the uploaded zip file locally. The copy runs in a thread so that a large package does not
+            # block the event loop for every other request.
             try:
-                agent = await self.agent_repo.get(name=name)
-            except ItemDoesNotExist:
-                agent = Agent(
-                    id=orm_id(),
-                    name=name,
-                    description=description,
-                    status=AgentStatus.PENDING,
-                    status_reason="Request to create agent received. Waiting for build process to start.",
-                    build_job_name=None,
-                    build_job_namespace=None,
-                    workflow_name=workflow_name,
-                    workflow_queue_name=workflow_queue_name,
+                package = await asyncio.to_thread(
+                    save_upload,
+                    source=agent_package.file,
+                    destination=Path(temp_dir) / Path(agent_package.filename).name,
+                    max_size_bytes=self.package_max_size_bytes,
                 )
+            except UploadTooLargeError:
+                await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
+                raise
+            logger.info(f"Saved agent package {package.path} ({package.size} bytes, sha256 {package.sha256})")
+
+            agent = Agent(
+                id=orm_id(),
+                name=name,
+                description=description,
+                status=AgentStatus.PENDING,
+                status_reason="Request to create agent received. Waiting for build process to start.",
+                build_job_name=None,
+                build_job_namespace=None,
+                workflow_name=workflow_name,
+                workflow_queue_name=workflow_queue_name,
+            )
 
             if update_if_exists:
-                agent.status = AgentStatus.PENDING
-                agent.status_reason = "Request to create agent received. Waiting for build process to start."
-                agent = await self.agent_repo.update(item=agent)
+                # An existing agent only has its status reset, and keeps its id and image so they can be reused
+                agent = await self.agent_repo.upsert(
+                    item=agent,
+                    conflict_columns=["name"],
+                    update_columns=["status", "status_reason"],
+                )
             else:
                 agent = await self.agent_repo.create(item=agent)
 
+            # Skip the build if the agent's current image was already built from an identical package. Images
+            # pushed under a shared tag may have been overwritten since, so only ones tagged with the package's
+            # digest are reused.
+            reuse_image = (
+                agent.package_digest == package.sha256
+                and agent.docker_image is not None
+                and agent.docker_image.endswith(f":{package_image_tag(package.sha256)}")
+            )
+            if reuse_image:
+                logger.info(f"Agent package for {agent.name} is unchanged, skipping the build")
+                await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
+
             await self._start_build_agent_workflow(
                 agent=agent,
-                agent_tar_path=str(file_location.absolute()),
+                agent_tar_path=None if reuse_image else package.path,
+                package_digest=package.sha256,
             )
 
             logger.info(f"Agent creation process started for: {agent}")
@@ -87,12 +119,14 @@ class AgentsUseCase:
     async def _start_build_agent_workflow(
         self,
         agent: Agent,
-        agent_tar_path: str,
+        agent_tar_path: Optional[str],
+        package_digest: str,
     ) -> str:
         return await self.async_runtime.start_workflow(
             BuildAgentWorkflow.run,
             BuildAgentWorkflowParams(
                 agent_tar_path=agent_tar_path,
+                package_digest=package_digest,
                 agent=agent,
             ),
             id=agent.id,
@@ -109,8 +143,21 @@ class AgentsUseCase:
     async def delete(self, id: Optional[str], name: Optional[str]) -> Agent:
         return await self.agent_repo.delete(id=id, name=name)
 
-    async def list(self) -> List[Agent]:
-        return await self.agent_repo.list()
+    async def list(
+        self,
+        status: Optional[List[AgentStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[Agent]:
+        return await self.agent_repo.list(
+            filters={"status": status} if status else None,
+            created_after=created_after,
+            created_before=created_before,
+            limit=limit,
+            cursor=cursor,
+        )
 
 
 DAgentsUseCase = Annotated[AgentsUseCase, Depends(AgentsUseCase)]
@@ -1,8 +1,9 @@
-from typing import Optional, List, Annotated
+from typing import Optional, Annotated
 
 from fastapi import Depends
 
 from agentex.domain.entities.agents import Agent
+from agentex.domain.entities.pagination import Page
 from agentex.domain.services.agents.agent_repository import DAgentRepository
 from agentex.utils.ids import orm_id
 from agentex.utils.logging import make_logger
@@ -31,7 +32,7 @@ class AgentCRUDService:
     async def delete(self, id: Optional[str], name: Optional[str]) -> Agent:
         return await self.agent_repo.delete(id=id, name=name)
 
-    async def list(self) -> List[Agent]:
+    async def list(self) -> Page[Agent]:
         return await self.agent_repo.list()
 
 
@@ -1,21 +1,78 @@
-from typing import Annotated, Optional, List
+import asyncio
+import time
+from datetime import datetime
+from typing import Annotated, Any, AsyncIterator, Dict, Optional, List, Tuple
 
 from fastapi import Depends
 
-from agentex.api.schemas.tasks import TaskModel, ModifyTaskRequest
+from agentex.adapters.async_runtime.adapter_temporal import TaskStatus
+from agentex.api.schemas.tasks import TaskModel, ModifyTaskRequest, CreateTaskRequest, BatchCreateTaskResult
+from agentex.config.dependencies import DEnvironmentVariables
+from agentex.domain.entities.agents import Agent
 from agentex.domain.entities.instructions import TaskModificationType
-from agentex.domain.entities.tasks import Task
+from agentex.domain.entities.pagination import Page
+from agentex.domain.entities.agent_state import AgentState
+from agentex.domain.entities.task_events import TaskEvent, TaskEventType
+from agentex.domain.entities.tasks import StoredTask, Task, TaskFields
+from agentex.domain.entities.workflows import WorkflowState
 from agentex.domain.exceptions import ClientError
+from agentex.domain.services.agent_tasks.task_admission import DTaskAdmission
 from agentex.domain.services.agent_tasks.task_service import DAgentTaskService
 from agentex.domain.services.agents.agent_repository import DAgentRepository
-from agentex.domain.services.agents.agent_state_repository import DAgentStateRepository
+from agentex.domain.services.agents.agent_state_repository import AgentStateRepository, DAgentStateRepository
+from agentex.domain.services.agents.task_event_repository import DTaskEventRepository
 from agentex.domain.services.agents.task_respository import DTaskRepository
+from agentex.utils.etags import etag_matches, make_etag
 from agentex.utils.ids import orm_id
 from agentex.utils.logging import make_logger
 
 logger = make_logger(__name__)
 
 
+async def _skip() -> None:
+    """Stands in for a read that was not requested when gathering reads concurrently."""
+    return None
+
+
+class _NewMessages:
+    """
+    Finds the messages appended to a task's threads since the agent state was last checked. The state is only
+    deserialized when what is stored has changed.
+    """
+
+    def __init__(
+        self,
+        agent_state_repository: AgentStateRepository,
+        task_id: str,
+        serialized_agent_state: Optional[str],
+    ):
+        self.agent_state_repository = agent_state_repository
+        self.task_id = task_id
+        self.serialized_agent_state = serialized_agent_state
+        self.message_counts = self._message_counts(agent_state_repository.deserialize(serialized_agent_state))
+
+    @staticmethod
+    def _message_counts(agent_state: AgentState) -> Dict[str, int]:
+        return {name: len(thread.messages) for name, thread in (agent_state.threads or {}).items()}
+
+    async def events(self) -> List[TaskEvent]:
+        serialized_agent_state = await self.agent_state_repository.load_serialized(task_id=self.task_id)
+        if serialized_agent_state == self.serialized_agent_state:
+            return []
+        self.serialized_agent_state = serialized_agent_state
+
+        agent_state = self.agent_state_repository.deserialize(serialized_agent_state)
+        events = [
+            TaskEvent(type=TaskEventType.MESSAGE, thread_name=name, message_index=index, message=message)
+            for name, thread in (agent_state.threads or {}).items()
+            for index, message in enumerate(thread.messages)
+            if index >= self.message_counts.get(name, 0)
+        ]
+        # A thread that was rewritten with fewer messages only has messages appended past its new length sent
+        self.message_counts = self._message_counts(agent_state)
+        return events
+
+
 class TasksUseCase:
 
     def __init__(
@@ -24,11 +81,19 @@ class TasksUseCase:
         task_repository: DTaskRepository,
         agent_repository: DAgentRepository,
         agent_state_repository: DAgentStateRepository,
+        task_event_repository: DTaskEventRepository,
+        task_admission: DTaskAdmission,
+        environment_variables: DEnvironmentVariables,
     ):
         self.task_service = task_service
         self.task_repository = task_repository
         self.agent_repository = agent_repository
         self.agent_state_repository = agent_state_repository
+        self.task_event_repository = task_event_repository
+        self.task_admission = task_admission
+        self.submission_concurrency = environment_variables.TASK_SUBMISSION_CONCURRENCY
+        self.events_heartbeat_seconds = environment_variables.TASK_EVENTS_HEARTBEAT_SECONDS
+        self.events_message_poll_seconds = environment_variables.TASK_EVENTS_MESSAGE_POLL_SECONDS
         self.model = "gpt-4o-mini"
 
     async def create(self, agent_name: str, prompt: str,
@@ -36,36 +101,349 @@ class TasksUseCase:
         agent = await self.agent_repository.get(
             name=agent_name,
         )
-        task = await self.task_repository.create(
-            Task(
-                id=orm_id(),
-                agent_id=agent.id,
-                prompt=prompt,
-            )
-        )
-        task_id = await self.task_service.submit_task(
-            task=task,
-            agent=agent,
-            require_approval=require_approval,
+        task = Task(
+            id=orm_id(),
+            agent_id=agent.id,
+            prompt=prompt,
         )
+        await self.task_admission.acquire_running_slot(agent=agent, task_id=task.id)
+        try:
+            task = await self.task_repository.create(task)
+            task_id = await self.task_service.submit_task(
+                task=task,
+                agent=agent,
+                require_approval=require_approval,
+            )
+        except Exception:
+            await self.task_admission.release_running_slots([task])
+            raise
         assert task_id == task.id, f"Task ID mismatch: {task_id} != {task.id}"
+        await self._publish_status(task_id=task.id, status=TaskStatus.RUNNING)
         return task
 
-    async def get(self, task_id: str) -> TaskModel:
+    async def batch_create(self, requests: List[CreateTaskRequest]) -> List[BatchCreateTaskResult]:
+        """
+        Create many tasks at once. Each distinct agent is looked up once, all tasks are inserted in a single
+        transaction and their workflows are started with bounded concurrency. A failure to start one task is
+        reported in its result and does not fail the rest of the batch.
+        """
+        agents = await self.agent_repository.batch_get(
+            names=list({request.agent_name for request in requests}),
+        )
+        agents_by_name = {agent.name: agent for agent in agents}
+
+        results: List[Optional[BatchCreateTaskResult]] = [None] * len(requests)
+        to_submit = []
+        for index, request in enumerate(requests):
+            agent = agents_by_name.get(request.agent_name)
+            if agent is None:
+                results[index] = BatchCreateTaskResult(
+                    index=index,
+                    error=f"Agent '{request.agent_name}' does not exist.",
+                )
+                continue
+            task = Task(id=orm_id(), agent_id=agent.id, prompt=request.prompt)
+            to_submit.append((index, request, agent, task))
+
+        async def admit(index: int, agent: Agent, task: Task) -> bool:
+            try:
+                # Tasks in a batch do not wait for slots, or a large batch would poll for each of its tasks
+                await self.task_admission.acquire_running_slot(agent=agent, task_id=task.id, wait=False)
+            except ClientError as error:
+                results[index] = BatchCreateTaskResult(index=index, error=str(error))
+                return False
+            return True
+
+        admitted = await asyncio.gather(*(admit(index, agent, task) for index, _, agent, task in to_submit))
+        to_submit = [item for item, is_admitted in zip(to_submit, admitted) if is_admitted]
+
+        if to_submit:
+            tasks = [task for _, _, _, task in to_submit]
+            try:
+                await self.task_repository.batch_create(tasks)
+            except Exception:
+                await self.task_admission.release_running_slots(tasks)
+                raise
+
+        semaphore = asyncio.Semaphore(self.submission_concurrency)
+        failed_tasks: List[Task] = []
+
+        async def submit(
+            index: int, request: CreateTaskRequest, agent: Agent, task: Task
+        ) -> BatchCreateTaskResult:
+            async with semaphore:
+                try:
+                    await self.task_service.submit_task(
+                        task=task,
+                        agent=agent,
+                        require_approval=request.require_approval,
+                    )
+                except Exception as error:
+                    logger.error(f"Failed to start workflow for task {task.id}: {error}")
+                    task.status = TaskStatus.FAILED
+                    task.status_reason = f"Failed to start task: {error}"
+                    failed_tasks.append(task)
+                    return BatchCreateTaskResult(index=index, task=TaskModel.from_orm(task), error=str(error))
+            await self._publish_status(task_id=task.id, status=TaskStatus.RUNNING)
+            return BatchCreateTaskResult(index=index, task=TaskModel.from_orm(task))
+
+        submitted = await asyncio.gather(*(submit(*item) for item in to_submit))
+
+        if failed_tasks:
+            await self._save_newly_terminal(failed_tasks)
+
+        for result in submitted:
+            results[result.index] = result
+        return results
+
+    async def get(self, task_id: str, fields: Optional[TaskFields] = None) -> TaskModel:
+        """
+        Get a task. Only the parts selected by `fields` are fetched; by default everything is.
+        """
+        _, task_model = await self.get_if_changed(task_id=task_id, fields=fields)
+        return task_model
+
+    async def get_if_changed(
+        self,
+        task_id: str,
+        fields: Optional[TaskFields] = None,
+        if_none_match: Optional[str] = None,
+    ) -> Tuple[str, Optional[TaskModel]]:
+        """
+        Get a task along with its ETag. If the ETag matches `if_none_match`, the task is returned as None
+        without deserializing its agent state or building the response.
+
+        The ETag is derived from the task row, its workflow status, the agent state as stored and the requested
+        `fields`.
+        """
+        fields = fields or TaskFields.all()
+        # The row, the workflow status and the agent state are independent, so fetch them concurrently
+        task, task_state, serialized_agent_state = await asyncio.gather(
+            self.task_repository.get(id=task_id),
+            self.task_service.get_state(task_id=task_id) if fields.status else _skip(),
+            self.agent_state_repository.load_serialized(task_id=task_id) if fields.agent_state else _skip(),
+        )
+
+        if task_state is not None and self._apply_workflow_state(task, task_state):
+            await self._save_newly_terminal([task])
+
+        etag = make_etag(task.to_json(), fields.to_json(), serialized_agent_state)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+
+        agent_state = self.agent_state_repository.deserialize(serialized_agent_state) if fields.agent_state else None
+        return etag, self._to_task_model(task, agent_state, fields)
+
+    async def batch_get(self, task_ids: List[str], fields: Optional[TaskFields] = None) -> List[TaskModel]:
+        """
+        Get many tasks at once. Rows, workflow statuses and agent states are each fetched in bulk and
+        concurrently with one another. Tasks that do not exist are left out of the result.
+        """
+        fields = fields or TaskFields.all()
+        task_ids = list(dict.fromkeys(task_ids))
+        tasks, task_states, agent_states = await asyncio.gather(
+            self.task_repository.batch_get(ids=task_ids),
+            self.task_service.batch_get_state(task_ids=task_ids) if fields.status else _skip(),
+            self.agent_state_repository.batch_load(task_ids=task_ids) if fields.agent_state else _skip(),
+        )
+        tasks_by_id = {task.id: task for task in tasks}
+        tasks = [tasks_by_id[task_id] for task_id in task_ids if task_id in tasks_by_id]
+        return await self._to_task_models(tasks, task_states, agent_states, fields)
+
+    async def wait_for_result(self, task_id: str, timeout_seconds: float) -> Optional[TaskModel]:
+        """
+        Wait up to `timeout_seconds` for the task to finish and return it in full. Returns None if the task is
+        still running at the timeout.
+        """
         task = await self.task_repository.get(id=task_id)
-        task_state = await self.task_service.get_state(task_id=task_id)
+        task_state = await self.task_service.wait_for_completion(task_id=task_id, timeout_seconds=timeout_seconds)
+        if task_state is None:
+            return None
+
         agent_state = await self.agent_state_repository.load(task_id=task_id)
+        if self._apply_workflow_state(task, task_state):
+            await self._save_newly_terminal([task])
+        return self._to_task_model(task, agent_state, TaskFields.all())
 
-        task.status = task_state.status
-        task.status_reason = task_state.reason
+    async def _to_task_models(
+        self,
+        tasks: List[Task],
+        task_states: Optional[Dict[str, WorkflowState]],
+        agent_states: Optional[Dict[str, AgentState]],
+        fields: TaskFields,
+    ) -> List[TaskModel]:
+        newly_terminal_tasks = []
+        task_models = []
+        for task in tasks:
+            if task_states is not None and self._apply_workflow_state(task, task_states[task.id]):
+                newly_terminal_tasks.append(task)
+            agent_state = agent_states[task.id] if agent_states is not None else None
+            task_models.append(self._to_task_model(task, agent_state, fields))
+
+        if newly_terminal_tasks:
+            await self._save_newly_terminal(newly_terminal_tasks)
+
+        return task_models
+
+    async def _save_newly_terminal(self, tasks: List[Task]) -> None:
+        """
+        Persist tasks that just reached a terminal status, free up their agents' running task slots and let
+        subscribers to their events know.
+        """
+        await self.task_repository.batch_update(tasks)
+        await self.task_admission.release_running_slots(tasks)
+        await asyncio.gather(*(
+            self._publish_status(
+                task_id=task.id,
+                status=task.status,
+                status_reason=task.status_reason,
+                is_terminal=True,
+            )
+            for task in tasks
+        ))
 
-        if task_state.is_terminal:
-            await self.update(task)
+    async def _publish_status(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        status_reason: Optional[str] = None,
+        is_terminal: bool = False,
+    ) -> None:
+        # The event stream is best effort, so a failure to publish must not fail the request that changed the task
+        try:
+            await self.task_event_repository.publish(
+                task_id=task_id,
+                event=TaskEvent(
+                    type=TaskEventType.STATUS,
+                    status=status,
+                    status_reason=status_reason,
+                    is_terminal=is_terminal,
+                ),
+            )
+        except Exception as error:
+            logger.error(f"Failed to publish status event for task {task_id}: {error}")
+
+    async def events(self, task_id: str, last_event_id: Optional[str] = None) -> AsyncIterator[Optional[TaskEvent]]:
+        """
+        Stream the events of a task. A new stream starts with a snapshot of the task's current status, followed
+        by every retained event. A resumed stream starts with the first event after `last_event_id`.
+
+        Agents write their state to Redis directly, so messages they append are found by checking the agent state
+        every TASK_EVENTS_MESSAGE_POLL_SECONDS. Only messages appended after the stream opened are sent, and they
+        are not replayed when a stream is resumed.
 
-        return TaskModel(
-            **task.to_dict(),
-            **agent_state.to_dict(),
+        Yields None whenever no event arrives within the heartbeat interval so that the caller can keep the
+        connection alive. The stream ends once the task has reached a terminal status and all of its events
+        have been sent.
+        """
+        task, task_state, serialized_agent_state = await asyncio.gather(
+            self.task_repository.get(id=task_id),
+            self.task_service.get_state(task_id=task_id) if last_event_id is None else _skip(),
+            self.agent_state_repository.load_serialized(task_id=task_id),
         )
+        new_messages = _NewMessages(
+            agent_state_repository=self.agent_state_repository,
+            task_id=task_id,
+            serialized_agent_state=serialized_agent_state,
+        )
+
+        async def stream() -> AsyncIterator[Optional[TaskEvent]]:
+            sent_terminal = False
+            if task_state is not None:
+                if self._apply_workflow_state(task, task_state):
+                    await self._save_newly_terminal([task])
+                sent_terminal = task_state.is_terminal
+                yield self._status_event(task, is_terminal=task_state.is_terminal)
+
+            # The terminal status is only published by whoever sees the workflow finish, so watch it here rather
+            # than rely on some other request happening to
+            watcher = None if sent_terminal else asyncio.ensure_future(self._wait_until_terminal(task))
+            try:
+                after_id = last_event_id
+                last_sent_at = time.monotonic()
+                while True:
+                    # Once the workflow has finished, its terminal status has been published, so only drain what
+                    # is left instead of waiting for more
+                    finished = sent_terminal or watcher.done()
+                    events = await self.task_event_repository.read(
+                        task_id=task_id,
+                        after_id=after_id,
+                        timeout_seconds=None if finished else self.events_message_poll_seconds,
+                    )
+                    # Messages go first, since an agent saves its last messages before its workflow finishes
+                    events = await new_messages.events() + events
+                    for event in events:
+                        if event.id is not None:
+                            after_id = event.id
+                        sent_terminal = sent_terminal or event.is_terminal
+                        yield event
+                    if events:
+                        last_sent_at = time.monotonic()
+                        continue
+                    if not finished:
+                        if time.monotonic() - last_sent_at >= self.events_heartbeat_seconds:
+                            last_sent_at = time.monotonic()
+                            yield None
+                        continue
+                    if not sent_terminal:
+                        # The terminal status event has already been trimmed from or expired out of the stream
+                        yield watcher.result()
+                    return
+            finally:
+                if watcher is not None:
+                    watcher.cancel()
+
+        return stream()
+
+    async def _wait_until_terminal(self, task: Task) -> TaskEvent:
+        """
+        Wait for the task's workflow to finish and persist and publish its terminal status if that has not been
+        done yet. Returns the terminal status as an event.
+        """
+        task_state = await self.task_service.wait_for_completion(task_id=task.id, timeout_seconds=None)
+        if self._apply_workflow_state(task, task_state):
+            await self._save_newly_terminal([task])
+        return self._status_event(task, is_terminal=True)
+
+    @staticmethod
+    def _status_event(task: Task, is_terminal: bool) -> TaskEvent:
+        return TaskEvent(
+            type=TaskEventType.STATUS,
+            status=task.status,
+            status_reason=task.status_reason,
+            is_terminal=is_terminal,
+        )
+
+    @staticmethod
+    def _to_task_model(task: Task, agent_state: Optional[AgentState], fields: TaskFields) -> TaskModel:
+        """
+        Build the response model. Agent state fields that were not requested are left unset so that they can
+        be excluded from the response.
+
+        The task and agent state have already been validated, so the model is constructed without validating
+        them again, which matters for agent states with long threads.
+        """
+        task_model = dict(task)
+        if agent_state is not None:
+            if fields.context:
+                task_model["context"] = agent_state.context
+            if fields.threads:
+                task_model["threads"] = {
+                    name: thread for name, thread in agent_state.threads.items()
+                    if fields.thread_names is None or name in fields.thread_names
+                }
+        return TaskModel.model_construct(**task_model)
+
+    @staticmethod
+    def _apply_workflow_state(task: Task, task_state: WorkflowState) -> bool:
+        """
+        Copy the workflow state onto the task. Returns whether the task reached a terminal status that has
+        not been persisted yet.
+        """
+        changed = task.status != task_state.status
+        task.status = task_state.status
+        task.status_reason = task_state.reason
+        return task_state.is_terminal and changed
 
     async def modify(self, task_id: str, modification_request: ModifyTaskRequest) -> None:
         if modification_request.type == TaskModificationType.CANCEL:
@@ -86,8 +464,79 @@ class TasksUseCase:
     async def delete(self, id: Optional[str], name: Optional[str]) -> Task:
         return await self.task_repository.delete(id=id, name=name)
 
-    async def list(self) -> List[Task]:
-        return await self.task_repository.list()
+    async def list(
+        self,
+        agent_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        status: Optional[List[TaskStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[TaskFields] = None,
+    ) -> Page[TaskModel]:
+        """
+        List tasks. Unlike `get`, only the task rows are returned unless more `fields` are requested, in which
+        case they are fetched in bulk for the whole page.
+        """
+        fields = fields or TaskFields()
+        filters = await self._list_filters(agent_id=agent_id, agent_name=agent_name, status=status)
+        page = await self.task_repository.list(
+            filters=filters,
+            created_after=created_after,
+            created_before=created_before,
+            limit=limit,
+            cursor=cursor,
+        )
+        task_ids = [task.id for task in page.items]
+        task_states, agent_states = await asyncio.gather(
+            self.task_service.batch_get_state(task_ids=task_ids) if fields.status else _skip(),
+            self.agent_state_repository.batch_load(task_ids=task_ids) if fields.agent_state else _skip(),
+        )
+        return Page[TaskModel](
+            items=await self._to_task_models(page.items, task_states, agent_states, fields),
+            next_cursor=page.next_cursor,
+        )
+
+    async def export(
+        self,
+        agent_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        status: Optional[List[TaskStatus]] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> AsyncIterator[StoredTask]:
+        """
+        Resolve the filters up front, so that bad input fails the request before any output is streamed,
+        and return an iterator over every matching task. Tasks carry their timestamps, so that a consumer can
+        continue an export from the last task it received.
+        """
+        filters = await self._list_filters(agent_id=agent_id, agent_name=agent_name, status=status)
+        return self.task_repository.stream(
+            filters=filters,
+            created_after=created_after,
+            created_before=created_before,
+            entity=StoredTask,
+        )
+
+    async def _list_filters(
+        self,
+        agent_id: Optional[str] = None,
+        agent_name: Optional[str] = None,
+        status: Optional[List[TaskStatus]] = None,
+    ) -> Dict[str, Any]:
+        filters = {}
+        if agent_name is not None:
+            agent = await self.agent_repository.get(name=agent_name)
+            if agent_id is not None and agent_id != agent.id:
+                raise ClientError(f"Agent '{agent_name}' does not have id '{agent_id}'.")
+            agent_id = agent.id
+        if agent_id is not None:
+            filters["agent_id"] = agent_id
+        if status:
+            # A task's status is only persisted once it finishes, so tasks without one are still running
+            filters["status"] = [*status, None] if TaskStatus.RUNNING in status else status
+        return filters
 
 
 DTaskUseCase = Annotated[TasksUseCase, Depends(TasksUseCase)]
@@ -15,3 +15,4 @@ class AgentActivity(str, Enum):
     DELETE_AGENT_SERVICE = "delete_agent_service"
     UPDATE_AGENT_STATUS = "update_agent_status"
     UPDATE_AGENT = "update_agent"
+    PATCH_AGENT = "patch_agent"
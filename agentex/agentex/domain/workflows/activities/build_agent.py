@@ -1,6 +1,6 @@
 import asyncio
 from datetime import timedelta
-from typing import Tuple, Optional
+from typing import TYPE_CHECKING, Any, Dict, Tuple, Optional
 
 from temporalio import workflow, activity
 from temporalio.common import RetryPolicy
@@ -12,18 +12,32 @@ from agentex.domain.entities.deployment import Deployment, DeploymentStatus
 from agentex.domain.entities.job import Job, JobStatus
 from agentex.domain.entities.service import Service
 from agentex.domain.exceptions import ServiceError
-from agentex.domain.services.agents.agent_service import DAgentService
 from agentex.domain.workflows.activities.activity_names import AgentActivity
 from agentex.domain.workflows.utils.activities import execute_workflow_activity
 from agentex.utils.logging import make_logger
 from agentex.utils.model_utils import BaseModel
 
+if TYPE_CHECKING:
+    # Only the worker builds the activities. Importing the service here would pull the Kubernetes client into
+    # everything that imports the workflow, including the API.
+    from agentex.domain.services.agents.agent_service import DAgentService
+
 logger = make_logger(__name__)
 
 
+def package_image_tag(package_digest: str) -> str:
+    """
+    The tag of the image built from a package. Tagging each image with its package's digest, instead of a
+    shared mutable tag, means the tag always refers to exactly that package's build.
+    """
+    return package_digest[:12]
+
+
 class BuildAgentImageParams(BaseModel):
     name: str
     zip_file_path: str
+    # Not set by workflows started before images were tagged with their package's digest
+    tag: Optional[str] = None
 
 
 class CreateAgentDeploymentParams(BaseModel):
@@ -33,16 +47,21 @@ class CreateAgentDeploymentParams(BaseModel):
 
 
 class UpdateAgentStatusParams(BaseModel):
-    agent: AgentActivity
+    agent_id: str
     status: AgentStatus
     reason: Optional[str] = None
 
 
+class PatchAgentParams(BaseModel):
+    id: str
+    fields: Dict[str, Any]
+
+
 class BuildAgentActivities:
 
     def __init__(
         self,
-        agent_service: DAgentService,
+        agent_service: "DAgentService",
         environment_variables: DEnvironmentVariables,
     ):
         self.agent_service = agent_service
@@ -54,7 +73,7 @@ class BuildAgentActivities:
         params: BuildAgentImageParams,
     ) -> Tuple[str, Job]:
         image = params.name
-        tag = "latest"
+        tag = params.tag or "latest"
         zip_file_path = params.zip_file_path
 
         return await self.agent_service.create_build_job(
@@ -138,13 +157,11 @@ class BuildAgentActivities:
     async def update_agent_status(
         self,
         params: UpdateAgentStatusParams,
-    ) -> AgentActivity:
-        agent = params.agent
-
-        agent.status = params.status
-        agent.status_reason = params.reason
-        return await self.agent_service.update_agent(
-            agent=agent,
+    ) -> Agent:
+        return await self.agent_service.patch_agent(
+            id=params.agent_id,
+            status=params.status,
+            status_reason=params.reason,
         )
 
     @activity.defn(name=AgentActivity.UPDATE_AGENT)
@@ -154,10 +171,18 @@ class BuildAgentActivities:
     ) -> Agent:
         return await self.agent_service.update_agent(agent=agent)
 
+    @activity.defn(name=AgentActivity.PATCH_AGENT)
+    async def patch_agent(
+        self,
+        params: PatchAgentParams,
+    ) -> Agent:
+        return await self.agent_service.patch_agent(id=params.id, **params.fields)
+
 
 async def build_and_push_agent(
     agent_name: str,
     agent_tar_path: str,
+    package_digest: Optional[str] = None,
 ) -> Tuple[str, Job]:
     # Start the agent build
     image_url, job = await workflow.execute_activity(
@@ -165,6 +190,7 @@ async def build_and_push_agent(
         arg=BuildAgentImageParams(
             name=agent_name,
             zip_file_path=agent_tar_path,
+            tag=package_image_tag(package_digest) if package_digest is not None else None,
         ),
         start_to_close_timeout=timedelta(seconds=60),
         retry_policy=RetryPolicy(maximum_attempts=0),  # TODO: Temporarily set to 0. Make this idempotent
@@ -1,21 +1,29 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Any, Optional
 
 from temporalio import workflow
 from temporalio.common import RetryPolicy
+from temporalio.contrib.opentelemetry import workflow as traced_workflow
 
 from agentex.domain.entities.agents import Agent, AgentStatus
 from agentex.domain.workflows.activities.activity_names import AgentActivity
-from agentex.domain.workflows.activities.build_agent import build_and_push_agent, start_agent_server
+from agentex.domain.workflows.activities.build_agent import PatchAgentParams, build_and_push_agent, start_agent_server
 from agentex.domain.workflows.utils.activities import execute_workflow_activity
 from agentex.utils.logging import make_logger
 from agentex.utils.model_utils import BaseModel
 
 logger = make_logger(__name__)
 
+# Marks the change to saving only the fields of the agent that changed. Workflows that started before it replay the
+# full updates they recorded.
+PATCH_AGENT_FIELDS = "patch-agent-fields"
+
 
 class BuildAgentWorkflowParams(BaseModel):
     agent: Agent
-    agent_tar_path: str
+    # Not set if the agent's current image was already built from this package, in which case it is reused
+    agent_tar_path: Optional[str] = None
+    package_digest: Optional[str] = None
 
 
 @workflow.defn
@@ -28,41 +36,82 @@ class BuildAgentWorkflow:
 
         agent_tar_path = params.agent_tar_path
 
-        agent.status = AgentStatus.BUILDING
-        agent.status_reason = "Agent is building its actions."
-        agent = await _update_agent(agent)
-
-        # try:
-        # Build the agent image and push it to the registry
-        image_url, job = await build_and_push_agent(
-            agent_name=agent_name,
-            agent_tar_path=agent_tar_path,
-        )
-
-        agent.docker_image = image_url
-        agent.build_job_name = job.name
-        agent.build_job_namespace = job.namespace
-        agent = await _update_agent(agent)
+        if agent_tar_path is not None:
+            agent = await _update_agent(
+                agent,
+                status=AgentStatus.BUILDING,
+                status_reason="Agent is building its actions.",
+            )
+
+            # try:
+            # Build the agent image and push it to the registry
+            build_started_at = workflow.now()
+            image_url, job = await build_and_push_agent(
+                agent_name=agent_name,
+                agent_tar_path=agent_tar_path,
+                package_digest=params.package_digest,
+            )
+            _record_phase("BuildAgentImage", started_at=build_started_at)
+
+            agent = await _update_agent(
+                agent,
+                docker_image=image_url,
+                package_digest=params.package_digest,
+                build_job_name=job.name,
+                build_job_namespace=job.namespace,
+            )
+        else:
+            workflow.logger.info(f"Agent package unchanged, reusing image {agent.docker_image}")
+            agent = await _update_agent(
+                agent,
+                status=AgentStatus.BUILDING,
+                status_reason="Agent package is unchanged. Deploying its existing image.",
+            )
 
         # Create the agent deployment and service to fetch the agent spec
+        rollout_started_at = workflow.now()
         await start_agent_server(agent=agent)
+        _record_phase("StartAgentServer", started_at=rollout_started_at)
 
-        agent.status = AgentStatus.READY
-        agent.status_reason = "Agent built and ready to receive tasks."
-        agent = await _update_agent(agent)
+        agent = await _update_agent(
+            agent,
+            status=AgentStatus.READY,
+            status_reason="Agent built and ready to receive tasks.",
+        )
 
         workflow.logger.info(f"Agent fully built and ready to receive tasks: {agent}")
 
         return agent
 
 
-async def _update_agent(agent: Agent) -> Agent:
-    agent = await execute_workflow_activity(
-        activity_name=AgentActivity.UPDATE_AGENT,
-        arg=agent,
-        start_to_close_timeout=timedelta(seconds=10),
-        retry_policy=RetryPolicy(maximum_attempts=3),
-        response_model=Agent,
+def _record_phase(name: str, started_at: datetime) -> None:
+    """
+    Record how long a phase of the build took on the workflow's trace. Workflows cannot hold spans open, so the
+    phase is recorded as a completed span carrying its duration, next to the spans of the activities it ran.
+    """
+    traced_workflow.completed_span(
+        f"AgentBuildPhase:{name}",
+        attributes={"agentex.phase.duration_seconds": (workflow.now() - started_at).total_seconds()},
     )
+
+
+async def _update_agent(agent: Agent, **fields: Any) -> Agent:
+    """Save the fields of the agent, updating only their columns, and return the agent as stored."""
+    if workflow.patched(PATCH_AGENT_FIELDS):
+        agent = await execute_workflow_activity(
+            activity_name=AgentActivity.PATCH_AGENT,
+            arg=PatchAgentParams(id=agent.id, fields=fields),
+            start_to_close_timeout=timedelta(seconds=10),
+            retry_policy=RetryPolicy(maximum_attempts=3),
+            response_model=Agent,
+        )
+    else:
+        agent = await execute_workflow_activity(
+            activity_name=AgentActivity.UPDATE_AGENT,
+            arg=agent.model_copy(update=fields),
+            start_to_close_timeout=timedelta(seconds=10),
+            retry_policy=RetryPolicy(maximum_attempts=3),
+            response_model=Agent,
+        )
     workflow.logger.info(f"Agent updated: {agent}")
     return agent
@@ -1,22 +1,32 @@
 import asyncio
 import uuid
 from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
 from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from temporalio.client import Client as TemporalClient
 from temporalio.worker import UnsandboxedWorkflowRunner, Worker
 
 from agentex.adapters.containers.build_adapter_kaniko import KanikoBuildGateway
 from agentex.adapters.http.adapter_httpx import HttpxGateway
 from agentex.adapters.kubernetes.adapter_kubernetes import KubernetesGateway
-from agentex.config.dependencies import GlobalDependencies, database_async_read_write_session_maker
+from agentex.config.dependencies import (
+    GlobalDependencies,
+    async_shutdown,
+    database_async_read_only_session_maker,
+    database_async_read_write_session_maker,
+)
 from agentex.config.environment_variables import EnvironmentVariables
 from agentex.domain.services.agents.agent_repository import AgentRepository
 from agentex.domain.services.agents.agent_service import AgentService
 from agentex.domain.workflows.activities.build_agent import BuildAgentActivities
 from agentex.domain.workflows.constants import BUILD_AGENT_TASK_QUEUE
 from agentex.domain.workflows.create_agent_workflow import BuildAgentWorkflow
+from agentex.utils import tracing
+from agentex.utils.blocking_calls import start_blocking_call_detector, stop_blocking_call_detector
 from agentex.utils.logging import make_logger
+from agentex.utils.saturation import saturation_monitor
 
 logger = make_logger(__name__)
 
@@ -34,13 +44,33 @@ class OverallHealthStatus:
 
     def __init__(self):
         self.create_agent_worker_status = HealthStatus(health=False)
+        self.environment_variables = EnvironmentVariables.refresh()
+
+    def saturation_reasons(self) -> List[str]:
+        return saturation_monitor.saturation_reasons(self.environment_variables)
 
     def get_health(self) -> bool:
-        return all([self.create_agent_worker_status.healthy])
+        return all([self.create_agent_worker_status.healthy, not self.saturation_reasons()])
 
 
 async def health_check(health_status: OverallHealthStatus):
-    return web.json_response(health_status.get_health())
+    # Report unhealthy with a 503, since probes only look at the status code
+    healthy = health_status.get_health()
+    if healthy:
+        return web.json_response(healthy)
+    reasons = health_status.saturation_reasons()
+    if reasons:
+        logger.warning(f"Worker is saturated: {'; '.join(reasons)}")
+    return web.json_response(healthy, status=503)
+
+
+async def liveness_check(_: web.Request):
+    # Only shows that the process is serving. Starting up or being saturated must not get the worker restarted.
+    return web.json_response(True)
+
+
+async def metrics(_: web.Request):
+    return web.Response(body=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
 
 
 async def run_create_agent_worker(
@@ -54,11 +84,17 @@ async def run_create_agent_worker(
         async_read_write_session_maker = database_async_read_write_session_maker(
             db_async_read_write_engine=global_dependencies.database_async_read_write_engine,
         )
+        async_read_only_session_maker = database_async_read_only_session_maker(
+            db_async_read_only_engine=global_dependencies.database_async_read_only_engine,
+        )
         agent_repository = AgentRepository(
             async_read_write_session_maker=async_read_write_session_maker,
+            async_read_only_session_maker=async_read_only_session_maker,
+            environment_variables=environment_variables,
         )
         k8s_gateway = KubernetesGateway(
-            http_gateway=HttpxGateway(),
+            http_gateway=HttpxGateway(http_client=global_dependencies.http_client),
+            api_client=await global_dependencies.get_kubernetes_api_client(),
             environment_variables=environment_variables,
         )
         build_gateway = KanikoBuildGateway(
@@ -94,6 +130,7 @@ async def run_create_agent_worker(
             ],
             activities=[
                 create_agent_activities.update_agent,
+                create_agent_activities.patch_agent,
                 build_agent_activities.build_agent_image,
                 build_agent_activities.get_build_job,
                 build_agent_activities.delete_build_job,
@@ -126,8 +163,17 @@ async def run_workers(health_status: OverallHealthStatus):
     temporal_address = environment_variables.TEMPORAL_ADDRESS
     logger.info(f"temporal address: {temporal_address}")
 
+    # Before the dependencies load, so that the Temporal client and database engine are instrumented
+    tracing.configure_tracing(service_name="agentex-worker", environment_variables=environment_variables)
+
+    saturation_monitor.start(
+        sample_interval_seconds=environment_variables.EVENT_LOOP_LAG_SAMPLE_INTERVAL_SECONDS,
+    )
+    if environment_variables.BLOCKING_CALL_DETECTION_ENABLED:
+        start_blocking_call_detector(threshold_seconds=environment_variables.BLOCKING_CALL_THRESHOLD_SECONDS)
     global_dependencies = GlobalDependencies()
     await global_dependencies.load()
+    await global_dependencies.warm_up()
 
     client = global_dependencies.temporal_client
 
@@ -145,6 +191,8 @@ async def run_workers(health_status: OverallHealthStatus):
 async def start_health_check_server(health_status: OverallHealthStatus):
     app = web.Application()
     app.router.add_get('/readyz', lambda request: health_check(health_status))  # Updated endpoint
+    app.router.add_get('/healthz', liveness_check)
+    app.router.add_get('/metrics', metrics)
 
     runner = web.AppRunner(app)
     await runner.setup()
@@ -156,7 +204,12 @@ async def start_health_check_server(health_status: OverallHealthStatus):
 async def main():
     health_status = OverallHealthStatus()  # Create health status object
     await start_health_check_server(health_status)
-    await run_workers(health_status=health_status)
+    try:
+        await run_workers(health_status=health_status)
+    finally:
+        stop_blocking_call_detector()
+        await async_shutdown()
+        tracing.shutdown_tracing()
 
 
 if __name__ == "__main__":
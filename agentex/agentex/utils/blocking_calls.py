@@ -0,0 +1,90 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from agentex.utils.logging import make_logger
+from agentex.utils.metrics import EVENT_LOOP_BLOCKS
+
+logger = make_logger(__name__)
+
+
+class BlockingCallDetector:
+    """
+    Reports, with the stack of the event loop thread, whenever a callback holds the event loop for longer than
+    `threshold_seconds`, so that blocking calls can be found and moved off the loop.
+
+    A task on the loop records a heartbeat, and a watchdog thread checks that the heartbeat keeps up. When it falls
+    behind, the loop thread is stuck in a callback, and its current stack shows where.
+    """
+
+    def __init__(self, threshold_seconds: float):
+        self.threshold_seconds = threshold_seconds
+        self.heartbeat_interval_seconds = threshold_seconds / 4
+        self._last_heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start watching the running event loop. Must be called from the loop's thread."""
+        if self._heartbeat is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat = asyncio.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="blocking-call-detector", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Reporting callbacks that block the event loop for more than {self.threshold_seconds}s")
+
+    def stop(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        self._stopped.set()
+
+    async def _beat(self) -> None:
+        while True:
+            self._last_heartbeat = time.monotonic()
+            await asyncio.sleep(self.heartbeat_interval_seconds)
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stopped.wait(self.heartbeat_interval_seconds):
+            last_heartbeat = self._last_heartbeat
+            if reported_heartbeat is not None and last_heartbeat != reported_heartbeat:
+                blocked_for = last_heartbeat - reported_heartbeat - self.heartbeat_interval_seconds
+                logger.warning(f"Event loop was blocked for {blocked_for:.3f}s")
+                reported_heartbeat = None
+
+            # The heartbeat sleeps between beats, so only time past that counts as blocked
+            blocked_for = time.monotonic() - last_heartbeat - self.heartbeat_interval_seconds
+            if blocked_for > self.threshold_seconds and last_heartbeat != reported_heartbeat:
+                # Report each block once, with the stack of the callback that is blocking while it still is
+                reported_heartbeat = last_heartbeat
+                EVENT_LOOP_BLOCKS.inc()
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = "".join(traceback.format_stack(frame)) if frame is not None else "unavailable\n"
+                logger.warning(
+                    f"Event loop has been blocked for {blocked_for:.3f}s, over the {self.threshold_seconds}s "
+                    f"threshold. Stack of the event loop thread:\n{stack}"
+                )
+
+
+blocking_call_detector: Optional[BlockingCallDetector] = None
+
+
+def start_blocking_call_detector(threshold_seconds: float) -> None:
+    global blocking_call_detector
+    if blocking_call_detector is None:
+        blocking_call_detector = BlockingCallDetector(threshold_seconds=threshold_seconds)
+    blocking_call_detector.start()
+
+
+def stop_blocking_call_detector() -> None:
+    if blocking_call_detector is not None:
+        blocking_call_detector.stop()
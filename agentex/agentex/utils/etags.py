@@ -0,0 +1,24 @@
+import hashlib
+from typing import Optional
+
+
+def make_etag(*parts: Optional[str]) -> str:
+    """Build a strong entity tag from the parts that determine a response body."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(b"\0" if part is None else part.encode())
+        # Separates the parts so that moving characters between them changes the tag
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an `If-None-Match` header matches the entity tag, using weak comparison as GET requires."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for candidate in if_none_match.split(",")
+    )
@@ -1,8 +1,42 @@
+import os
+import threading
+import time
 import uuid
 
+_lock = threading.Lock()
+_last_millis = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    A UUIDv7 (RFC 9562): a 48 bit millisecond timestamp followed by random bits, so that ids sort, as UUIDs or as
+    strings, in the order they were made. Within a millisecond, a 12 bit counter keeps ids from this process in
+    order.
+    """
+    global _last_millis, _counter
+    with _lock:
+        millis = time.time_ns() // 1_000_000
+        if millis > _last_millis:
+            _last_millis = millis
+            _counter = int.from_bytes(os.urandom(2)) & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # The counter ran out within this millisecond, so borrow the next one
+                _last_millis += 1
+                _counter = 0
+            millis = _last_millis
+        counter = _counter
+
+    random_bits = int.from_bytes(os.urandom(8)) & ((1 << 62) - 1)
+    value = (millis & ((1 << 48) - 1)) << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | random_bits
+    return uuid.UUID(int=value)
+
 
 def orm_id():
-    return str(uuid.uuid4())
+    # Time ordered, so that new rows are appended to the end of primary key indexes instead of scattered over them
+    return str(uuid7())
 
 
 def short_id():
@@ -0,0 +1,85 @@
+import functools
+import inspect
+import time
+from typing import Callable, Optional, Type, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Dependency calls are often sub-millisecond, so the buckets start lower than prometheus_client's defaults
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "agentex_http_request_duration_seconds",
+    "Time spent handling HTTP requests, including streaming the response body.",
+    ["method", "route", "status_code"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "agentex_http_requests_in_progress",
+    "HTTP requests currently being handled.",
+    ["method", "route"],
+)
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "agentex_db_pool_checkout_duration_seconds",
+    "Time database sessions waited for a connection from the pool, including its pre-ping.",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+EVENT_LOOP_LAG = Histogram(
+    "agentex_event_loop_lag_seconds",
+    "How late the event loop ran a periodically scheduled callback.",
+    buckets=LATENCY_BUCKETS,
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "agentex_event_loop_blocks",
+    "Times a callback held the event loop for longer than the blocking call detection threshold.",
+)
+DEPENDENCY_CALL_DURATION = Histogram(
+    "agentex_dependency_call_duration_seconds",
+    "Time spent in calls to outbound dependencies.",
+    ["dependency", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+C = TypeVar("C", bound=Type)
+
+
+def _timed(function: Callable, dependency: str, operation: str, scope_attribute: Optional[str]) -> Callable:
+    @functools.wraps(function)
+    async def wrapper(*args, **kwargs):
+        scope = getattr(args[0], scope_attribute, None) if scope_attribute and args else None
+        labels = {"dependency": dependency, "operation": f"{scope}.{operation}" if scope else operation}
+        start = time.perf_counter()
+        try:
+            result = await function(*args, **kwargs)
+        except BaseException:
+            DEPENDENCY_CALL_DURATION.labels(**labels, outcome="error").observe(time.perf_counter() - start)
+            raise
+        DEPENDENCY_CALL_DURATION.labels(**labels, outcome="success").observe(time.perf_counter() - start)
+        return result
+
+    return wrapper
+
+
+def instrument(dependency: str, scope_attribute: Optional[str] = None) -> Callable[[C], C]:
+    """
+    Class decorator that records the duration of every public coroutine method of an adapter in
+    DEPENDENCY_CALL_DURATION, labelled with the method name as the operation.
+
+    If `scope_attribute` is given, the operation is prefixed with that attribute of the instance, so that calls made
+    through one generic adapter class (e.g. one repository per table) can be told apart.
+    """
+
+    def decorate(cls: C) -> C:
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith("_"):
+                continue
+            if isinstance(attribute, staticmethod) and inspect.iscoroutinefunction(attribute.__func__):
+                setattr(cls, name, staticmethod(_timed(attribute.__func__, dependency, name, None)))
+            elif inspect.iscoroutinefunction(attribute):
+                setattr(cls, name, _timed(attribute, dependency, name, scope_attribute))
+        return cls
+
+    return decorate
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from agentex.config.environment_variables import EnvironmentVariables
+from agentex.utils.logging import make_logger
+from agentex.utils.metrics import EVENT_LOOP_LAG
+
+logger = make_logger(__name__)
+
+# Saturation is judged on the worst sample seen this recently, so that one slow sample does not flap readiness for
+# long, but a sustained problem keeps the process unready
+SATURATION_WINDOW_SECONDS = 10
+
+
+class RecentMax:
+    """The largest value recorded within the last `window_seconds`."""
+
+    def __init__(self, window_seconds: float = SATURATION_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, float]] = deque()
+
+    def record(self, value: float) -> None:
+        now = time.monotonic()
+        # Samples smaller than a newer one can never be the max again
+        while self._samples and self._samples[-1][1] <= value:
+            self._samples.pop()
+        self._samples.append((now, value))
+        self._expire(now)
+
+    def value(self) -> float:
+        self._expire(time.monotonic())
+        return self._samples[0][1] if self._samples else 0.0
+
+    def _expire(self, now: float) -> None:
+        while self._samples and self._samples[0][0] < now - self.window_seconds:
+            self._samples.popleft()
+
+
+class SaturationMonitor:
+    """
+    Tracks signals that show this process is overloaded, so that it can report itself unready and shed load
+    before requests queue up behind it: how long database sessions wait for a pooled connection, how late the
+    event loop runs scheduled callbacks, and how many requests are in flight.
+    """
+
+    def __init__(self):
+        self.in_flight_requests = 0
+        self.db_checkout_wait = RecentMax()
+        self.event_loop_lag = RecentMax()
+        self._lag_sampler: Optional[asyncio.Task] = None
+
+    def record_db_checkout_wait(self, seconds: float) -> None:
+        self.db_checkout_wait.record(seconds)
+
+    def start(self, sample_interval_seconds: float) -> None:
+        """Start sampling the lag of the running event loop."""
+        if self._lag_sampler is None:
+            self._lag_sampler = asyncio.create_task(self._sample_event_loop_lag(sample_interval_seconds))
+
+    def stop(self) -> None:
+        if self._lag_sampler is not None:
+            self._lag_sampler.cancel()
+            self._lag_sampler = None
+
+    async def _sample_event_loop_lag(self, interval_seconds: float) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval_seconds)
+            # Anything past the interval is time this wake-up spent waiting for the loop to get to it
+            lag = max(0.0, time.perf_counter() - start - interval_seconds)
+            self.event_loop_lag.record(lag)
+            EVENT_LOOP_LAG.observe(lag)
+
+    def saturation_reasons(self, environment_variables: EnvironmentVariables) -> List[str]:
+        """Describe each signal that is over its configured threshold. Empty if the process is not saturated."""
+        reasons = []
+        max_db_checkout_wait = environment_variables.READINESS_MAX_DB_CHECKOUT_WAIT_SECONDS
+        if max_db_checkout_wait is not None and self.db_checkout_wait.value() > max_db_checkout_wait:
+            reasons.append(
+                f"Database connection checkout took {self.db_checkout_wait.value():.3f}s, "
+                f"over the {max_db_checkout_wait}s threshold"
+            )
+        max_event_loop_lag = environment_variables.READINESS_MAX_EVENT_LOOP_LAG_SECONDS
+        if max_event_loop_lag is not None and self.event_loop_lag.value() > max_event_loop_lag:
+            reasons.append(
+                f"Event loop lagged by {self.event_loop_lag.value():.3f}s, over the {max_event_loop_lag}s threshold"
+            )
+        max_in_flight_requests = environment_variables.READINESS_MAX_IN_FLIGHT_REQUESTS
+        if max_in_flight_requests is not None and self.in_flight_requests > max_in_flight_requests:
+            reasons.append(
+                f"{self.in_flight_requests} requests in flight, over the {max_in_flight_requests} threshold"
+            )
+        return reasons
+
+
+saturation_monitor = SaturationMonitor()
@@ -0,0 +1,49 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _SharedWait(Generic[T]):
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SharedWaits(Generic[T]):
+    """
+    Lets concurrent callers waiting on the same key share a single underlying wait. The wait is started by the
+    first caller and canceled once the last caller has stopped waiting, whether it finished or timed out.
+    """
+
+    def __init__(self):
+        self._waits: Dict[str, _SharedWait[T]] = {}
+
+    async def wait(
+        self, key: str, start: Callable[[], Awaitable[T]], timeout_seconds: Optional[float]
+    ) -> Optional[T]:
+        """
+        Wait up to `timeout_seconds`, or for as long as it takes if it is None, for the wait on `key`, starting
+        it with `start` if nobody is waiting on it yet. Returns None if the wait did not finish in time.
+        """
+        shared_wait = self._waits.get(key)
+        if shared_wait is None:
+            shared_wait = _SharedWait(asyncio.ensure_future(start()))
+            self._waits[key] = shared_wait
+            shared_wait.task.add_done_callback(lambda _: self._forget(key, shared_wait))
+
+        shared_wait.waiters += 1
+        try:
+            # Shielded so that a caller timing out or disconnecting does not cancel the wait for everyone else
+            return await asyncio.wait_for(asyncio.shield(shared_wait.task), timeout_seconds)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            shared_wait.waiters -= 1
+            if shared_wait.waiters == 0 and not shared_wait.task.done():
+                shared_wait.task.cancel()
+                self._forget(key, shared_wait)
+
+    def _forget(self, key: str, shared_wait: _SharedWait[T]) -> None:
+        if self._waits.get(key) is shared_wait:
+            del self._waits[key]
@@ -1,8 +1,8 @@
 import dataclasses
 import datetime
-from typing import Any, Optional, Type, Union
+from typing import Any, Optional, Sequence, Type, Union
 
-from temporalio.client import Client
+from temporalio.client import Client, Interceptor
 from temporalio.converter import (
     AdvancedJSONEncoder,
     CompositePayloadConverter,
@@ -51,14 +51,21 @@ custom_data_converter = dataclasses.replace(
 )
 
 
-async def get_temporal_client(temporal_address: str, metrics_url: str = None) -> Client:
+async def get_temporal_client(
+    temporal_address: str,
+    metrics_url: str = None,
+    interceptors: Sequence[Interceptor] = (),
+) -> Client:
     if not metrics_url:
         client = await Client.connect(
-            target_host=temporal_address, data_converter=custom_data_converter
+            target_host=temporal_address, data_converter=custom_data_converter, interceptors=interceptors
         )
     else:
         runtime = Runtime(telemetry=TelemetryConfig(metrics=OpenTelemetryConfig(url=metrics_url)))
         client = await Client.connect(
-            target_host=temporal_address, data_converter=custom_data_converter, runtime=runtime
+            target_host=temporal_address,
+            data_converter=custom_data_converter,
+            interceptors=interceptors,
+            runtime=runtime,
         )
     return client
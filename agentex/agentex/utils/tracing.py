@@ -0,0 +1,138 @@
+from enum import Enum
+from typing import TYPE_CHECKING, Any, List, Optional
+
+from opentelemetry import trace
+from temporalio import activity, client as temporal_client, worker as temporal_worker
+
+from agentex.config.environment_variables import EnvironmentVariables
+from agentex.utils.logging import make_logger
+
+if TYPE_CHECKING:
+    # The SDK, exporters and instrumentations take a noticeable part of startup, so they are only imported once
+    # tracing is enabled
+    from fastapi import FastAPI
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SpanExporter
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = make_logger(__name__)
+
+# Routes that are polled by infrastructure and would drown out real traffic
+EXCLUDED_URLS = "/metrics,/readyz,/healthz"
+
+_tracer_provider: Optional["TracerProvider"] = None
+
+
+class TracingExporter(str, Enum):
+    OTLP = "otlp"
+    CONSOLE = "console"
+    FILE = "file"
+
+
+class ActivityQueueTimeInterceptor(temporal_client.Interceptor, temporal_worker.Interceptor):
+    """
+    Records how long each activity attempt waited in its task queue before a worker picked it up on the activity's
+    span, so that slow steps can be told apart from a backlog of work.
+    """
+
+    def intercept_activity(
+        self, next: temporal_worker.ActivityInboundInterceptor
+    ) -> temporal_worker.ActivityInboundInterceptor:
+        return _ActivityQueueTimeInboundInterceptor(next)
+
+
+class _ActivityQueueTimeInboundInterceptor(temporal_worker.ActivityInboundInterceptor):
+
+    async def execute_activity(self, input: temporal_worker.ExecuteActivityInput) -> Any:
+        info = activity.info()
+        if info.current_attempt_scheduled_time and info.started_time:
+            trace.get_current_span().set_attribute(
+                "temporal.activity.queue_time_seconds",
+                (info.started_time - info.current_attempt_scheduled_time).total_seconds(),
+            )
+        trace.get_current_span().set_attribute("temporal.activity.attempt", info.attempt)
+        return await super().execute_activity(input)
+
+
+def _span_exporter(environment_variables: EnvironmentVariables) -> "SpanExporter":
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    exporter = environment_variables.TRACING_EXPORTER
+    if exporter == TracingExporter.OTLP:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        # The endpoint and headers are read from the standard OTEL_EXPORTER_OTLP_* variables
+        return OTLPSpanExporter()
+    if exporter == TracingExporter.CONSOLE:
+        return ConsoleSpanExporter()
+    if exporter == TracingExporter.FILE:
+        traces_file = open(environment_variables.TRACING_FILE_PATH, "a")
+        return ConsoleSpanExporter(out=traces_file, formatter=lambda span: span.to_json(indent=None) + "\n")
+    raise ValueError(
+        f"Unknown tracing exporter '{exporter}'. Use one of: {', '.join(e.value for e in TracingExporter)}."
+    )
+
+
+def configure_tracing(service_name: str, environment_variables: EnvironmentVariables) -> bool:
+    """
+    Set up the global tracer provider and instrument the Redis, httpx and aiohttp (used by kubernetes_asyncio)
+    clients, if a tracing exporter is configured. Returns whether tracing is enabled.
+    """
+    global _tracer_provider
+    if _tracer_provider is not None:
+        return True
+    if not environment_variables.TRACING_EXPORTER:
+        return False
+
+    from opentelemetry.instrumentation.aiohttp_client import AioHttpClientInstrumentor
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.instrumentation.redis import RedisInstrumentor
+    from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    _tracer_provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: service_name}),
+        sampler=ParentBased(TraceIdRatioBased(environment_variables.TRACING_SAMPLE_RATIO)),
+    )
+    _tracer_provider.add_span_processor(BatchSpanProcessor(_span_exporter(environment_variables)))
+    trace.set_tracer_provider(_tracer_provider)
+
+    RedisInstrumentor().instrument()
+    HTTPXClientInstrumentor().instrument()
+    AioHttpClientInstrumentor().instrument()
+    logger.info(f"Tracing enabled for {service_name}, exporting to {environment_variables.TRACING_EXPORTER}")
+    return True
+
+
+def instrument_app(app: "FastAPI") -> None:
+    if _tracer_provider is not None:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
+        FastAPIInstrumentor.instrument_app(app, tracer_provider=_tracer_provider, excluded_urls=EXCLUDED_URLS)
+
+
+def instrument_database_engine(engine: "AsyncEngine") -> None:
+    if _tracer_provider is not None:
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
+        SQLAlchemyInstrumentor().instrument(engine=engine.sync_engine, tracer_provider=_tracer_provider)
+
+
+def temporal_interceptors() -> List[temporal_client.Interceptor]:
+    """
+    Interceptors for the Temporal client, which carry the current trace into workflows and activities. Workers
+    created from the client pick them up as well.
+    """
+    if _tracer_provider is None:
+        return []
+    from temporalio.contrib.opentelemetry import TracingInterceptor
+
+    return [TracingInterceptor(), ActivityQueueTimeInterceptor()]
+
+
+def shutdown_tracing() -> None:
+    """Flush the spans that have not been exported yet."""
+    if _tracer_provider is not None:
+        _tracer_provider.shutdown()
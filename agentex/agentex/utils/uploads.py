@@ -0,0 +1,61 @@
+import hashlib
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from agentex.domain.exceptions import ClientError
+from agentex.utils.model_utils import BaseModel
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ClientError):
+    """
+    Exception raised when an uploaded file is larger than allowed.
+    """
+
+    code = 413
+
+
+class SavedUpload(BaseModel):
+    path: str
+    size: int
+    sha256: str
+
+
+def hash_upload(source: BinaryIO, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """The sha256 of an uploaded file, read in chunks. Blocking, so call it in a thread."""
+    digest = hashlib.sha256()
+    source.seek(0)
+    while chunk := source.read(chunk_size):
+        digest.update(chunk)
+    source.seek(0)
+    return digest.hexdigest()
+
+
+def save_upload(
+    source: BinaryIO,
+    destination: Path,
+    max_size_bytes: Optional[int] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> SavedUpload:
+    """
+    Copy an uploaded file to disk in chunks, hashing it along the way. Blocking, so call it in a thread.
+
+    Raises UploadTooLargeError, and removes the partial file, as soon as more than `max_size_bytes` have been
+    read.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    source.seek(0)
+    try:
+        with open(destination, "wb") as buffer:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if max_size_bytes is not None and size > max_size_bytes:
+                    raise UploadTooLargeError(f"Upload is larger than the maximum of {max_size_bytes} bytes.")
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+    return SavedUpload(path=str(destination.absolute()), size=size, sha256=digest.hexdigest())
@@ -0,0 +1,46 @@
+"""add task indexes
+
+Revision ID: 8b2d4f6a1c93
+Revises: 3f1c9a7d5e20
+Create Date: 2026-10-17 11:30:41.907215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d4f6a1c93'
+down_revision: Union[str, None] = '3f1c9a7d5e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so that tasks can still be written while the indexes build, which cannot run in a
+    # transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_agent_id_created_at_id', 'tasks', ['agent_id', 'created_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tasks_created_at_id', 'tasks', ['created_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_tasks_non_terminal', 'tasks', ['created_at', 'id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+            postgresql_where=sa.text("status IS NULL OR status = 'RUNNING'"),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_non_terminal', table_name='tasks', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_tasks_created_at_id', table_name='tasks', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(
+            'ix_tasks_agent_id_created_at_id', table_name='tasks', postgresql_concurrently=True, if_exists=True,
+        )
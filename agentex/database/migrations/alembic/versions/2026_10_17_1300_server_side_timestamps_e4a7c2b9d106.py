@@ -0,0 +1,34 @@
+"""server side timestamps
+
+Revision ID: e4a7c2b9d106
+Revises: 8b2d4f6a1c93
+Create Date: 2026-10-17 13:00:27.530918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c2b9d106'
+down_revision: Union[str, None] = '8b2d4f6a1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['agents', 'tasks']
+
+
+def upgrade() -> None:
+    # Timestamps used to be set by the application from a value fixed when it started. The database now sets them
+    # as rows are written. Existing rows keep the timestamps they were written with.
+    for table in TABLES:
+        op.alter_column(table, 'created_at', server_default=sa.text('now()'))
+        op.alter_column(table, 'updated_at', server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, 'updated_at', server_default=None)
+        op.alter_column(table, 'created_at', server_default=None)
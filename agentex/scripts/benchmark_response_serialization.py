@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import time
+from typing import Callable, List, Tuple
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from starlette.responses import JSONResponse
+
+from agentex.api.responses import ModelResponse
+from agentex.api.schemas.tasks import TaskModel
+from agentex.domain.entities.agent_state import AgentState, Thread
+from agentex.domain.entities.messages import UserMessage, AssistantMessage
+from agentex.domain.entities.tasks import Task, TaskFields
+from agentex.domain.use_cases.tasks_use_case import TasksUseCase
+
+
+def make_task_and_state(message_count: int, message_size: int) -> Tuple[Task, AgentState]:
+    messages = []
+    for i in range(message_count):
+        message_class = UserMessage if i % 2 == 0 else AssistantMessage
+        messages.append(message_class(content="x" * message_size))
+    state = AgentState(threads={"main": Thread(messages=messages)}, context={"step": message_count})
+    # Round trip through JSON so the state looks like one loaded from Redis
+    state = AgentState.from_json(state.to_json())
+    task = Task(id="task-id", agent_id="agent-id", prompt="Benchmark the response path", status="RUNNING")
+    return task, state
+
+
+def previous_path(task: Task, state: AgentState, field) -> bytes:
+    # Build the model by revalidating dumps of the task and its state, then let FastAPI validate it against
+    # the response model and run it through `jsonable_encoder` before rendering it
+    task_model = TaskModel(**task.to_dict(), **state.to_dict())
+    content = asyncio.run(serialize_response(field=field, response_content=task_model, exclude_unset=True))
+    return JSONResponse(content).body
+
+
+def fast_path(task: Task, state: AgentState, _) -> bytes:
+    task_model = TasksUseCase._to_task_model(task, state, TaskFields.all())
+    return ModelResponse(task_model, exclude_unset=True).body
+
+
+def time_per_call(path: Callable, task: Task, state: AgentState, field, iterations: int) -> float:
+    path(task, state, field)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        path(task, state, field)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the cost of serializing TaskModel responses.')
+    parser.add_argument('--message-counts', type=int, nargs='+', default=[0, 10, 100, 1000, 10000],
+                        help='The number of messages in the task\'s thread, one benchmark per count')
+    parser.add_argument('--message-size', type=int, default=500, help='The number of characters per message')
+    parser.add_argument('--iterations', type=int, default=20, help='The number of responses to time per size')
+    args = parser.parse_args()
+
+    field = create_model_field(name="Response_get_task", type_=TaskModel, mode="serialization")
+    rows: List[str] = []
+    for message_count in args.message_counts:
+        task, state = make_task_and_state(message_count, args.message_size)
+        assert previous_path(task, state, field) == fast_path(task, state, field)
+        previous = time_per_call(previous_path, task, state, field, args.iterations)
+        fast = time_per_call(fast_path, task, state, field, args.iterations)
+        size = len(fast_path(task, state, field))
+        rows.append(
+            f"{message_count:>9} {size / 1024:>12.1f} {previous * 1000:>13.3f} {fast * 1000:>10.3f} "
+            f"{previous / fast:>8.1f}x"
+        )
+
+    print(f"{'messages':>9} {'size (KiB)':>12} {'previous (ms)':>13} {'fast (ms)':>10} {'speedup':>9}")
+    print("\n".join(rows))
+
+
+if __name__ == '__main__':
+    main()
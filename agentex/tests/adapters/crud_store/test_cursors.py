@@ -0,0 +1,35 @@
+import base64
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from agentex.adapters.crud_store.adapter_postgres import decode_cursor, encode_cursor
+from agentex.adapters.crud_store.exceptions import InvalidCursorError
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 17, 9, 30, 15, 123456, tzinfo=timezone.utc)
+
+    assert decode_cursor(encode_cursor(created_at, "task-1")) == (created_at, "task-1")
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime.now(timezone.utc), "?/+&")
+
+    assert all(character.isalnum() or character in "-_=" for character in cursor)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(json.dumps(["2026-10-17T09:30:15"]).encode()).decode(),
+        base64.urlsafe_b64encode(json.dumps(["yesterday", "task-1"]).encode()).decode(),
+        base64.urlsafe_b64encode(json.dumps(None).encode()).decode(),
+    ],
+)
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
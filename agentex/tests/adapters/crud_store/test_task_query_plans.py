@@ -0,0 +1,160 @@
+"""
+Checks with EXPLAIN that the task queries the repository runs are served by the task indexes. Runs against the
+migrated database at DATABASE_URL and is skipped if it is not set. Rows are only seeded in transactions that are
+rolled back, so nothing is written to the database.
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Set
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from agentex.adapters.async_runtime.adapter_temporal import TaskStatus
+from agentex.adapters.crud_store.adapter_postgres import encode_cursor
+from agentex.adapters.orm import TaskORM
+from agentex.config.environment_variables import EnvironmentVariables
+from agentex.domain.services.agents.task_respository import TaskRepository
+from agentex.utils.database import async_db_engine_creator
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("DATABASE_URL"),
+    reason="Needs a migrated Postgres database at DATABASE_URL",
+)
+
+PAGE_SIZE = 100
+SEED_AGENTS = 1000
+SEED_TASKS = 100000
+AGENT_ID = "explain-agent-0"
+RUNNING = [TaskStatus.RUNNING, None]
+
+# Tasks spread over many agents, one in a hundred still running, as in a long-lived deployment. The planner only
+# picks indexes over a table large enough to need them.
+SEED_SQL = [
+    """
+    INSERT INTO agents (id, name, description, packaging_method, status, workflow_name, workflow_queue_name)
+    SELECT 'explain-agent-' || i, 'explain-agent-' || i, 'Seeded by test_task_query_plans', 'DOCKER', 'READY',
+        'explain', 'explain'
+    FROM generate_series(0, :agents - 1) AS i
+    """,
+    """
+    INSERT INTO tasks (id, agent_id, prompt, status, created_at, updated_at)
+    SELECT 'explain-task-' || i, 'explain-agent-' || (i % :agents), 'Seeded by test_task_query_plans',
+        CASE WHEN i % 100 = 0 THEN NULL ELSE 'COMPLETED'::taskstatus END,
+        now() - i * interval '1 second', now() - i * interval '1 second'
+    FROM generate_series(1, :tasks) AS i
+    """,
+    "ANALYZE agents",
+    "ANALYZE tasks",
+]
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+@pytest_asyncio.fixture
+async def explain():
+    """Explains queries against a seeded tasks table. Returns the nodes of each query's plan."""
+    environment_variables = EnvironmentVariables.refresh()
+    engine = create_async_engine(
+        "postgresql+asyncpg://",
+        async_creator=async_db_engine_creator(environment_variables.DATABASE_URL),
+    )
+    session_maker = async_sessionmaker(autoflush=False, bind=engine, expire_on_commit=False)
+    task_repository = TaskRepository(session_maker, session_maker, environment_variables)
+    try:
+        async with session_maker() as session, session.begin():
+            for statement in SEED_SQL:
+                await session.execute(text(statement), {"agents": SEED_AGENTS, "tasks": SEED_TASKS})
+
+            async def explain_query(build_query):
+                plan = await session.scalar(Explain(build_query(task_repository)))
+                plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+                return list(_plan_nodes(plan))
+
+            yield explain_query
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+
+def _cursor() -> str:
+    return encode_cursor(datetime.now(timezone.utc) - timedelta(days=1), "explain-task-0")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "build_query, indexes, ordered_by_index",
+    [
+        pytest.param(
+            lambda repository: repository._page_query(limit=PAGE_SIZE),
+            {"ix_tasks_created_at_id"},
+            True,
+            id="list tasks",
+        ),
+        pytest.param(
+            lambda repository: repository._page_query(limit=PAGE_SIZE, cursor=_cursor()),
+            {"ix_tasks_created_at_id"},
+            True,
+            id="list tasks after a cursor",
+        ),
+        pytest.param(
+            lambda repository: repository._page_query(
+                filters={"agent_id": AGENT_ID}, limit=PAGE_SIZE, cursor=_cursor()
+            ),
+            {"ix_tasks_agent_id_created_at_id"},
+            # Unless an agent has many tasks, sorting the few that match can be cheaper than reading them in order
+            False,
+            id="list an agent's tasks after a cursor",
+        ),
+        pytest.param(
+            lambda repository: repository._page_query(
+                filters={"agent_id": AGENT_ID, "status": RUNNING}, limit=PAGE_SIZE
+            ),
+            {"ix_tasks_agent_id_created_at_id", "ix_tasks_non_terminal"},
+            False,
+            id="list an agent's running tasks",
+        ),
+        pytest.param(
+            lambda repository: repository._page_query(filters={"status": RUNNING}, limit=PAGE_SIZE),
+            {"ix_tasks_non_terminal"},
+            True,
+            id="list running tasks",
+        ),
+        pytest.param(
+            # The check Postgres runs for the tasks foreign key when an agent is deleted
+            lambda repository: select(TaskORM.id).where(TaskORM.agent_id == AGENT_ID).with_for_update(key_share=True),
+            {"ix_tasks_agent_id_created_at_id"},
+            False,
+            id="check for an agent's tasks before deleting it",
+        ),
+    ],
+)
+async def test_task_query_uses_index(explain, build_query, indexes: Set[str], ordered_by_index: bool):
+    nodes = await explain(build_query)
+    used = {node["Index Name"] for node in nodes if "Index Name" in node}
+
+    assert not any(node["Node Type"] == "Seq Scan" for node in nodes), nodes
+    assert used & indexes, nodes
+    if ordered_by_index:
+        assert not any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes), nodes
@@ -0,0 +1,147 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from starlette.responses import Response
+
+from agentex.api.idempotency import (
+    IDEMPOTENT_REPLAY_HEADER,
+    IdempotencyKeyInUseError,
+    IdempotencyKeyReusedError,
+    IdempotentRequests,
+)
+from agentex.domain.exceptions import ClientError
+
+
+class CountingHandler:
+
+    def __init__(self, status_code: int = 201, body: str = '{"id": "task-1"}'):
+        self.status_code = status_code
+        self.body = body
+        self.calls = 0
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        return Response(content=self.body, status_code=self.status_code, media_type="application/json")
+
+
+@pytest.fixture
+def idempotent_requests(mock_memory_repo):
+    return IdempotentRequests(
+        memory_repo=mock_memory_repo,
+        environment_variables=SimpleNamespace(
+            IDEMPOTENCY_KEY_TTL_SECONDS=60,
+            IDEMPOTENCY_LOCK_TTL_SECONDS=60,
+            IDEMPOTENCY_WAIT_SECONDS=0.3,
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeated_request_is_replayed(idempotent_requests):
+    handler = CountingHandler()
+
+    first = await idempotent_requests.run("tasks", "key-1", "payload", handler)
+    second = await idempotent_requests.run("tasks", "key-1", "payload", handler)
+
+    assert handler.calls == 1
+    assert first.headers.get(IDEMPOTENT_REPLAY_HEADER) is None
+    assert second.headers[IDEMPOTENT_REPLAY_HEADER] == "true"
+    assert (second.status_code, second.body, second.media_type) == (201, first.body, "application/json")
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped(idempotent_requests):
+    handler = CountingHandler()
+
+    await idempotent_requests.run("tasks", "key-1", "payload", handler)
+    await idempotent_requests.run("agents", "key-1", "payload", handler)
+
+    assert handler.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_requests_without_a_key_always_run(idempotent_requests):
+    handler = CountingHandler()
+
+    await idempotent_requests.run("tasks", None, "payload", handler)
+    await idempotent_requests.run("tasks", None, "payload", handler)
+
+    assert handler.calls == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("key", ["", "k" * 256])
+async def test_invalid_key_is_rejected(idempotent_requests, key):
+    with pytest.raises(ClientError):
+        await idempotent_requests.run("tasks", key, "payload", CountingHandler())
+
+
+@pytest.mark.asyncio
+async def test_key_reused_for_a_different_request_is_rejected(idempotent_requests):
+    await idempotent_requests.run("tasks", "key-1", "payload", CountingHandler())
+
+    with pytest.raises(IdempotencyKeyReusedError) as error:
+        await idempotent_requests.run("tasks", "key-1", "other payload", CountingHandler())
+    assert error.value.code == 422
+
+
+@pytest.mark.asyncio
+async def test_request_in_flight_is_rejected_after_waiting(idempotent_requests):
+    release = asyncio.Event()
+
+    async def slow_handler() -> Response:
+        await release.wait()
+        return Response(status_code=201)
+
+    first = asyncio.create_task(idempotent_requests.run("tasks", "key-1", "payload", slow_handler))
+    await asyncio.sleep(0)
+
+    with pytest.raises(IdempotencyKeyInUseError) as error:
+        await idempotent_requests.run("tasks", "key-1", "payload", CountingHandler())
+    assert error.value.code == 409
+
+    release.set()
+    assert (await first).status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_for_the_first_response(idempotent_requests):
+    release = asyncio.Event()
+    handler = CountingHandler()
+
+    async def slow_handler() -> Response:
+        await release.wait()
+        return await handler()
+
+    first = asyncio.create_task(idempotent_requests.run("tasks", "key-1", "payload", slow_handler))
+    await asyncio.sleep(0)
+    duplicate = asyncio.create_task(idempotent_requests.run("tasks", "key-1", "payload", slow_handler))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert (await first).body == (await duplicate).body
+    assert handler.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_request_releases_the_key(idempotent_requests):
+    async def failing_handler() -> Response:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await idempotent_requests.run("tasks", "key-1", "payload", failing_handler)
+
+    handler = CountingHandler()
+    await idempotent_requests.run("tasks", "key-1", "payload", handler)
+    assert handler.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_unsuccessful_response_is_not_stored(idempotent_requests):
+    rejected = CountingHandler(status_code=400)
+    await idempotent_requests.run("tasks", "key-1", "payload", rejected)
+
+    handler = CountingHandler()
+    await idempotent_requests.run("tasks", "key-1", "payload", handler)
+    assert handler.calls == 1
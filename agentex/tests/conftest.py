@@ -0,0 +1,102 @@
+import asyncio
+import time
+from typing import List, Any, Dict, Optional, Tuple
+
+import pytest
+
+from agentex.adapters.kv_store.port import MemoryRepository
+
+
+class FakeMemoryRepo(MemoryRepository):
+
+    def __init__(self):
+        self.data = {}
+        self.streams = {}
+        self.buckets = {}
+        self.leases = {}
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        self.data[key] = value
+
+    async def set_if_not_exists(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def batch_set(self, updates: Dict[str, Any]) -> None:
+        self.data.update(updates)
+
+    async def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    async def batch_get(self, keys: List[str]) -> List[Any]:
+        return [self.data.get(key) for key in keys]
+
+    async def delete(self, key: str) -> Any:
+        return self.data.pop(key, None)
+
+    async def batch_delete(self, keys: List[str]) -> List[Any]:
+        return [self.data.pop(key, None) for key in keys]
+
+    async def take_tokens(self, key: str, rate_per_second: float, capacity: int, tokens: int = 1) -> float:
+        now = time.monotonic()
+        available, updated_at = self.buckets.get(key, (capacity, now))
+        available = min(capacity, available + (now - updated_at) * rate_per_second)
+        wait = 0 if available >= tokens else (tokens - available) / rate_per_second
+        self.buckets[key] = (available - tokens if wait == 0 else available, now)
+        return wait
+
+    async def acquire_lease(self, key: str, holder: str, limit: int, lease_seconds: float) -> bool:
+        now = time.monotonic()
+        leases = {h: expiry for h, expiry in self.leases.get(key, {}).items() if expiry > now}
+        self.leases[key] = leases
+        if holder not in leases and len(leases) >= limit:
+            return False
+        leases[holder] = now + lease_seconds
+        return True
+
+    async def release_leases(self, key: str, holders: List[str]) -> None:
+        for holder in holders:
+            self.leases.get(key, {}).pop(holder, None)
+
+    async def get_lease_holders(self, key: str) -> List[str]:
+        return list(self.leases.get(key, {}))
+
+    async def publish(self, channel: str, message: str) -> None:
+        pass
+
+    async def subscribe(self, channel: str):
+        pass
+
+    async def append_to_stream(
+        self,
+        key: str,
+        message: str,
+        max_length: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> str:
+        stream = self.streams.setdefault(key, [])
+        message_id = f"{len(stream) + 1}-0"
+        stream.append((message_id, message))
+        return message_id
+
+    async def read_stream(
+        self,
+        key: str,
+        after_id: Optional[str] = None,
+        timeout_seconds: Optional[float] = None,
+        count: Optional[int] = None,
+    ) -> List[Tuple[str, str]]:
+        after = int(after_id.split("-")[0]) if after_id else 0
+        entries = self.streams.get(key, [])[after:]
+        if not entries and timeout_seconds:
+            # Stands in for a blocking read, without waking up early for new entries
+            await asyncio.sleep(timeout_seconds)
+            entries = self.streams.get(key, [])[after:]
+        return entries[:count] if count else entries
+
+
+@pytest.fixture(scope="function")
+def mock_memory_repo():
+    return FakeMemoryRepo()
@@ -0,0 +1,49 @@
+import pytest
+
+from agentex.domain.entities.tasks import TaskFields
+from agentex.domain.exceptions import ClientError
+
+
+def test_parse_nothing():
+    assert TaskFields.parse([]) == TaskFields()
+
+
+def test_parse_fields():
+    fields = TaskFields.parse(["status", "context"])
+
+    assert fields.status and fields.context
+    assert not fields.threads
+    assert fields.agent_state
+
+
+def test_parse_comma_separated_fields():
+    assert TaskFields.parse(["status, threads", "context"]) == TaskFields.all()
+
+
+def test_parse_named_threads():
+    fields = TaskFields.parse(["threads.planner", "threads.executor"])
+
+    assert fields.threads
+    assert fields.thread_names == {"planner", "executor"}
+    assert not fields.context
+
+
+def test_parse_all_threads_wins_over_named_threads():
+    fields = TaskFields.parse(["threads.planner", "threads"])
+
+    assert fields.threads
+    assert fields.thread_names is None
+
+
+def test_parse_status_only_does_not_need_agent_state():
+    assert not TaskFields.parse(["status"]).agent_state
+
+
+@pytest.mark.parametrize("field", ["prompt", "threads.", "status.x"])
+def test_parse_rejects_unknown_fields(field):
+    with pytest.raises(ClientError):
+        TaskFields.parse([field])
+
+
+def test_thread_names_serialize_in_a_stable_order():
+    assert TaskFields.parse(["threads.b,threads.a"]).to_json() == TaskFields.parse(["threads.a,threads.b"]).to_json()
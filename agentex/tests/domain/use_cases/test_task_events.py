@@ -0,0 +1,133 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agentex.adapters.async_runtime.adapter_temporal import TaskStatus
+from agentex.domain.entities.agent_state import AgentState, Thread
+from agentex.domain.entities.messages import UserMessage
+from agentex.domain.entities.task_events import TaskEventType
+from agentex.domain.entities.tasks import Task
+from agentex.domain.entities.workflows import WorkflowState
+from agentex.domain.services.agents.agent_state_repository import AgentStateRepository
+from agentex.domain.services.agents.task_event_repository import TaskEventRepository
+from agentex.domain.use_cases.tasks_use_case import TasksUseCase
+
+TASK_ID = "task-1"
+
+
+class FakeTaskService:
+    """A task whose workflow runs until `finish` is called."""
+
+    def __init__(self):
+        self.finished = asyncio.Event()
+
+    def finish(self):
+        self.finished.set()
+
+    async def get_state(self, task_id: str) -> WorkflowState:
+        return WorkflowState(status=TaskStatus.RUNNING, reason=None, is_terminal=False)
+
+    async def wait_for_completion(self, task_id: str, timeout_seconds) -> WorkflowState:
+        await self.finished.wait()
+        return WorkflowState(status=TaskStatus.COMPLETED, reason="Done", is_terminal=True)
+
+
+class FakeTaskRepository:
+
+    async def get(self, id: str) -> Task:
+        return Task(id=id, agent_id="agent-1", prompt="prompt")
+
+    async def batch_update(self, tasks):
+        return tasks
+
+
+class FakeTaskAdmission:
+
+    async def release_running_slots(self, tasks):
+        pass
+
+
+@pytest.fixture
+def environment_variables():
+    return SimpleNamespace(
+        TASK_SUBMISSION_CONCURRENCY=1,
+        TASK_EVENTS_MAX_LENGTH=100,
+        TASK_EVENTS_TTL_SECONDS=60,
+        TASK_EVENTS_HEARTBEAT_SECONDS=0.05,
+        TASK_EVENTS_MESSAGE_POLL_SECONDS=0.01,
+    )
+
+
+@pytest.fixture
+def task_service():
+    return FakeTaskService()
+
+
+@pytest.fixture
+def agent_state_repository(mock_memory_repo):
+    return AgentStateRepository(memory_repo=mock_memory_repo)
+
+
+@pytest.fixture
+def tasks_use_case(mock_memory_repo, environment_variables, task_service, agent_state_repository):
+    return TasksUseCase(
+        task_service=task_service,
+        task_repository=FakeTaskRepository(),
+        agent_repository=None,
+        agent_state_repository=agent_state_repository,
+        task_event_repository=TaskEventRepository(mock_memory_repo, environment_variables),
+        task_admission=FakeTaskAdmission(),
+        environment_variables=environment_variables,
+    )
+
+
+def agent_state(*contents: str) -> AgentState:
+    return AgentState(threads={"main": Thread(messages=[UserMessage(role="user", content=c) for c in contents])})
+
+
+async def next_event(stream):
+    """The next event on the stream, skipping keep-alives."""
+    while (event := await anext(stream)) is None:
+        pass
+    return event
+
+
+@pytest.mark.asyncio
+async def test_appended_message_is_streamed(tasks_use_case, agent_state_repository, task_service):
+    stream = await tasks_use_case.events(task_id=TASK_ID)
+    assert (await next_event(stream)).status == TaskStatus.RUNNING
+
+    await agent_state_repository.save(task_id=TASK_ID, state=agent_state("Hello"))
+    event = await asyncio.wait_for(next_event(stream), timeout=1)
+
+    assert event.type == TaskEventType.MESSAGE
+    assert (event.thread_name, event.message_index, event.message.content) == ("main", 0, "Hello")
+
+    task_service.finish()
+    event = await asyncio.wait_for(next_event(stream), timeout=1)
+    assert (event.type, event.status, event.is_terminal) == (TaskEventType.STATUS, TaskStatus.COMPLETED, True)
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(anext(stream), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_only_messages_appended_after_opening_are_streamed(tasks_use_case, agent_state_repository):
+    await agent_state_repository.save(task_id=TASK_ID, state=agent_state("Earlier"))
+    stream = await tasks_use_case.events(task_id=TASK_ID)
+    await next_event(stream)
+
+    await agent_state_repository.save(task_id=TASK_ID, state=agent_state("Earlier", "Later"))
+    event = await asyncio.wait_for(next_event(stream), timeout=1)
+
+    assert (event.message_index, event.message.content) == (1, "Later")
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_keep_alives(tasks_use_case):
+    stream = await tasks_use_case.events(task_id=TASK_ID)
+    await next_event(stream)
+
+    assert await asyncio.wait_for(anext(stream), timeout=1) is None
+    await stream.aclose()
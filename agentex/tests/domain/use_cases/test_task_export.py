@@ -0,0 +1,53 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from agentex.adapters.orm import TaskORM
+from agentex.domain.use_cases.tasks_use_case import TasksUseCase
+
+CREATED_AT = datetime(2026, 10, 17, 9, 30, tzinfo=timezone.utc)
+
+
+class StreamingTaskRepository:
+    """Builds tasks from ORM rows the way the Postgres repository does."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def stream(self, filters=None, created_after=None, created_before=None, entity=None):
+        for row in self.rows:
+            yield entity.from_orm(row)
+
+
+@pytest.mark.asyncio
+async def test_exported_tasks_include_timestamps():
+    rows = [
+        TaskORM(
+            id=f"task-{i}",
+            agent_id="agent-1",
+            prompt="prompt",
+            created_at=CREATED_AT + timedelta(seconds=i),
+            updated_at=CREATED_AT + timedelta(minutes=i),
+        )
+        for i in range(2)
+    ]
+    tasks_use_case = TasksUseCase(
+        task_service=None,
+        task_repository=StreamingTaskRepository(rows),
+        agent_repository=None,
+        agent_state_repository=None,
+        task_event_repository=None,
+        task_admission=None,
+        environment_variables=SimpleNamespace(
+            TASK_SUBMISSION_CONCURRENCY=1,
+            TASK_EVENTS_HEARTBEAT_SECONDS=1,
+            TASK_EVENTS_MESSAGE_POLL_SECONDS=1,
+        ),
+    )
+
+    exported = [json.loads(task.to_json()) async for task in await tasks_use_case.export()]
+
+    assert [datetime.fromisoformat(task["created_at"]) for task in exported] == [row.created_at for row in rows]
+    assert [datetime.fromisoformat(task["updated_at"]) for task in exported] == [row.updated_at for row in rows]
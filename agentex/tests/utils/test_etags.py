@@ -0,0 +1,48 @@
+from agentex.utils.etags import etag_matches, make_etag
+
+
+def test_etag_is_a_quoted_strong_tag():
+    etag = make_etag("a", "b")
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert not etag.startswith("W/")
+
+
+def test_etag_is_stable():
+    assert make_etag("a", None, "b") == make_etag("a", None, "b")
+
+
+def test_etag_depends_on_how_parts_are_split():
+    assert make_etag("ab", "c") != make_etag("a", "bc")
+
+
+def test_etag_tells_missing_and_empty_parts_apart():
+    assert make_etag(None) != make_etag("")
+
+
+def test_etag_matches_exact_tag():
+    etag = make_etag("a")
+
+    assert etag_matches(etag, etag)
+    assert not etag_matches(make_etag("b"), etag)
+
+
+def test_etag_matches_any_tag_in_a_list():
+    etag = make_etag("a")
+
+    assert etag_matches(f'{make_etag("b")}, {etag}', etag)
+
+
+def test_etag_matches_weakly():
+    etag = make_etag("a")
+
+    assert etag_matches(f"W/{etag}", etag)
+
+
+def test_etag_matches_wildcard():
+    assert etag_matches("*", make_etag("a"))
+
+
+def test_etag_does_not_match_without_header():
+    assert not etag_matches(None, make_etag("a"))
+    assert not etag_matches("", make_etag("a"))
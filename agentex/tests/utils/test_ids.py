@@ -0,0 +1,33 @@
+import time
+import uuid
+
+from agentex.utils.ids import orm_id, uuid7
+
+
+def test_uuid7_version_and_variant():
+    id = uuid7()
+
+    assert id.version == 7
+    assert id.variant == uuid.RFC_4122
+
+
+def test_uuid7_carries_the_current_time():
+    before = time.time_ns() // 1_000_000
+    id = uuid7()
+    after = time.time_ns() // 1_000_000
+
+    # Can run slightly ahead if the counter ran out within a millisecond
+    assert before <= id.int >> 80 <= after + 1
+
+
+def test_uuid7_is_monotonic():
+    ids = [uuid7() for _ in range(20_000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_orm_ids_sort_as_strings():
+    ids = [orm_id() for _ in range(20_000)]
+
+    assert ids == sorted(ids)
@@ -0,0 +1,16 @@
+import io
+
+from agentex.utils.uploads import hash_upload, save_upload
+
+
+def test_hash_upload_matches_saved_upload(tmp_path):
+    source = io.BytesIO(b"agent package" * 1000)
+
+    sha256 = hash_upload(source, chunk_size=7)
+
+    assert source.tell() == 0
+    assert sha256 == save_upload(source, destination=tmp_path / "package.zip").sha256
+
+
+def test_hash_upload_tells_same_size_packages_apart():
+    assert hash_upload(io.BytesIO(b"package a")) != hash_upload(io.BytesIO(b"package b"))